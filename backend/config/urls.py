@@ -1,11 +1,14 @@
 from django.contrib import admin
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 
+_HEALTH_OK_BODY = b'{"status": "ok"}'
+
+
 def health_check(request):
-    return JsonResponse({'status': 'ok'})
+    return HttpResponse(_HEALTH_OK_BODY, content_type='application/json')
 
 
 urlpatterns = [
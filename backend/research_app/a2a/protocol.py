@@ -11,17 +11,31 @@ Agent Cards:
   - EvaluationAgent: Evaluates papers using the AGI framework
   - SynthesisAgent: Generates comprehensive reports from evaluations
 """
-import json
+import time
 import uuid
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+import orjson
+
+from research_app.agents.config import get_config
+from research_app.agents.planner import create_execution_plan
+from research_app.agents.discovery import discover_and_process_papers
+from research_app.agents.evaluation import evaluate_paper
+
 logger = logging.getLogger("research_app.a2a")
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize an artifact payload to a JSON string."""
+    return orjson.dumps(obj, default=str).decode()
+
+
 class TaskState(Enum):
     SUBMITTED = "submitted"
     WORKING = "working"
@@ -31,7 +45,18 @@ class TaskState(Enum):
     CANCELED = "canceled"
 
 
-@dataclass
+_ST_SUBMITTED = TaskState.SUBMITTED.value
+_ST_WORKING = TaskState.WORKING.value
+_ST_COMPLETED = TaskState.COMPLETED.value
+_ST_FAILED = TaskState.FAILED.value
+_ST_CANCELED = TaskState.CANCELED.value
+
+
+_DEFAULT_INPUT_MODES = ("text/plain",)
+_DEFAULT_OUTPUT_MODES = ("text/plain", "application/json")
+
+
+@dataclass(slots=True)
 class AgentCard:
     """A2A Agent Card describing an agent's capabilities."""
     name: str
@@ -40,26 +65,42 @@ class AgentCard:
     version: str = "1.0.0"
     capabilities: Dict[str, Any] = field(default_factory=dict)
     skills: List[Dict[str, str]] = field(default_factory=list)
-    default_input_modes: List[str] = field(default_factory=lambda: ["text/plain"])
-    default_output_modes: List[str] = field(default_factory=lambda: ["text/plain", "application/json"])
+    default_input_modes: Tuple[str, ...] = _DEFAULT_INPUT_MODES
+    default_output_modes: Tuple[str, ...] = _DEFAULT_OUTPUT_MODES
 
     def to_dict(self):
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class A2ATask:
     """An A2A task exchanged between agents."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     session_id: Optional[str] = None
-    status: str = TaskState.SUBMITTED.value
+    status: str = _ST_SUBMITTED
     messages: List[Dict[str, Any]] = field(default_factory=list)
     artifacts: List[Dict[str, Any]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at_ns: int = field(default_factory=time.time_ns)
+
+    @property
+    def created_at(self) -> str:
+        # Formatted on demand; most tasks are created far more often than read.
+        return datetime.fromtimestamp(self.created_at_ns / 1e9).isoformat()
 
     def to_dict(self):
-        return asdict(self)
+        # Shallow on purpose: the result is serialized straight into the
+        # response, so aliasing the task's lists/dicts is safe and avoids
+        # the deep copy asdict() would make of large artifacts.
+        return {
+            "id": self.id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "messages": self.messages,
+            "artifacts": self.artifacts,
+            "metadata": self.metadata,
+            "created_at": self.created_at,
+        }
 
 
 class A2AAgentBase:
@@ -67,10 +108,16 @@ class A2AAgentBase:
 
     def __init__(self, card: AgentCard):
         self.card = card
-        self.tasks: Dict[str, A2ATask] = {}
+        # Oldest tasks are evicted once the store exceeds max_tasks. The
+        # dispatcher runs in request threads, so LRU updates hold the lock.
+        self.tasks: "OrderedDict[str, A2ATask]" = OrderedDict()
+        self._tasks_lock = threading.Lock()
+        self.max_tasks = get_config().a2a_max_tasks
+        # The card never changes after construction, so serialize it once.
+        self._card_dict = card.to_dict()
 
     def get_agent_card(self) -> Dict[str, Any]:
-        return self.card.to_dict()
+        return self._card_dict
 
     def send_task(self, task_data: Dict[str, Any]) -> A2ATask:
         task = A2ATask(
@@ -78,16 +125,23 @@ class A2AAgentBase:
             messages=task_data.get("message", {}).get("parts", []),
             metadata=task_data.get("metadata", {}),
         )
-        self.tasks[task.id] = task
+        with self._tasks_lock:
+            self.tasks[task.id] = task
+            if len(self.tasks) > self.max_tasks:
+                self.tasks.popitem(last=False)
         return self._process_task(task)
 
     def get_task(self, task_id: str) -> Optional[A2ATask]:
-        return self.tasks.get(task_id)
+        with self._tasks_lock:
+            task = self.tasks.get(task_id)
+            if task:
+                self.tasks.move_to_end(task_id)
+        return task
 
     def cancel_task(self, task_id: str) -> Optional[A2ATask]:
-        task = self.tasks.get(task_id)
+        task = self.get_task(task_id)
         if task:
-            task.status = TaskState.CANCELED.value
+            task.status = _ST_CANCELED
         return task
 
     def _process_task(self, task: A2ATask) -> A2ATask:
@@ -111,9 +165,8 @@ class PlannerA2AAgent(A2AAgentBase):
         ))
 
     def _process_task(self, task: A2ATask) -> A2ATask:
-        task.status = TaskState.WORKING.value
+        task.status = _ST_WORKING
         try:
-            from research_app.agents.planner import create_execution_plan
             objective = ""
             for msg in task.messages:
                 if isinstance(msg, dict) and msg.get("type") == "text":
@@ -123,11 +176,11 @@ class PlannerA2AAgent(A2AAgentBase):
             plan = create_execution_plan(objective or "General AGI research")
             task.artifacts.append({
                 "name": "execution_plan",
-                "parts": [{"type": "application/json", "data": json.dumps(plan)}],
+                "parts": [{"type": "application/json", "data": _dumps(plan)}],
             })
-            task.status = TaskState.COMPLETED.value
+            task.status = _ST_COMPLETED
         except Exception as e:
-            task.status = TaskState.FAILED.value
+            task.status = _ST_FAILED
             task.metadata["error"] = str(e)
         return task
 
@@ -149,9 +202,8 @@ class DiscoveryA2AAgent(A2AAgentBase):
         ))
 
     def _process_task(self, task: A2ATask) -> A2ATask:
-        task.status = TaskState.WORKING.value
+        task.status = _ST_WORKING
         try:
-            from research_app.agents.discovery import discover_and_process_papers
             params = task.metadata.get("params", {})
             result = discover_and_process_papers(
                 query=params.get("query", "artificial general intelligence"),
@@ -161,11 +213,11 @@ class DiscoveryA2AAgent(A2AAgentBase):
             )
             task.artifacts.append({
                 "name": "discovery_result",
-                "parts": [{"type": "application/json", "data": json.dumps(result, default=str)}],
+                "parts": [{"type": "application/json", "data": _dumps(result)}],
             })
-            task.status = TaskState.COMPLETED.value
+            task.status = _ST_COMPLETED
         except Exception as e:
-            task.status = TaskState.FAILED.value
+            task.status = _ST_FAILED
             task.metadata["error"] = str(e)
         return task
 
@@ -187,50 +239,94 @@ class EvaluationA2AAgent(A2AAgentBase):
         ))
 
     def _process_task(self, task: A2ATask) -> A2ATask:
-        task.status = TaskState.WORKING.value
+        task.status = _ST_WORKING
         try:
-            from research_app.agents.evaluation import evaluate_paper
             paper_data = task.metadata.get("paper", {})
             result = evaluate_paper(paper_data)
             task.artifacts.append({
                 "name": "evaluation_result",
-                "parts": [{"type": "application/json", "data": json.dumps(result, default=str)}],
+                "parts": [{"type": "application/json", "data": _dumps(result)}],
             })
-            task.status = TaskState.COMPLETED.value
+            task.status = _ST_COMPLETED
         except Exception as e:
-            task.status = TaskState.FAILED.value
+            task.status = _ST_FAILED
             task.metadata["error"] = str(e)
         return task
 
 
-# Agent registry
-_agents = {
-    "planner": PlannerA2AAgent(),
-    "discovery": DiscoveryA2AAgent(),
-    "evaluation": EvaluationA2AAgent(),
-}
+# Agent registry, built on first use so processes that never serve A2A
+# requests don't pay for constructing the agents.
+_agents: Optional[Dict[str, A2AAgentBase]] = None
+_agent_cards_by_name: Dict[str, Dict[str, Any]] = {}
+_agent_cards: List[Dict[str, Any]] = []
+_agents_lock = threading.Lock()
+
+
+def _get_agents() -> Dict[str, A2AAgentBase]:
+    global _agents, _agent_cards_by_name, _agent_cards
+    if _agents is None:
+        with _agents_lock:
+            if _agents is None:
+                agents = {
+                    "planner": PlannerA2AAgent(),
+                    "discovery": DiscoveryA2AAgent(),
+                    "evaluation": EvaluationA2AAgent(),
+                }
+                _agent_cards_by_name = {name: agent.get_agent_card() for name, agent in agents.items()}
+                _agent_cards = list(_agent_cards_by_name.values())
+                _agents = agents
+    return _agents
 
 
 def get_agent_cards() -> List[Dict[str, Any]]:
-    return [agent.get_agent_card() for agent in _agents.values()]
+    _get_agents()
+    return _agent_cards
+
+
+_agent_cards_json: Optional[bytes] = None
+
+
+def get_agent_cards_json() -> bytes:
+    """Agent cards pre-encoded as JSON; the cards are static once built."""
+    global _agent_cards_json
+    if _agent_cards_json is None:
+        _agent_cards_json = orjson.dumps(get_agent_cards(), default=str)
+    return _agent_cards_json
+
+
+def _handle_send(agent: A2AAgentBase, data: dict) -> dict:
+    return agent.send_task(data).to_dict()
+
+
+def _handle_get(agent: A2AAgentBase, data: dict) -> dict:
+    task = agent.get_task(data.get("id", ""))
+    return task.to_dict() if task else {"error": "Task not found"}
+
+
+def _handle_cancel(agent: A2AAgentBase, data: dict) -> dict:
+    task = agent.cancel_task(data.get("id", ""))
+    return task.to_dict() if task else {"error": "Task not found"}
+
+
+_METHODS = {
+    "tasks/send": _handle_send,
+    "tasks/get": _handle_get,
+    "tasks/cancel": _handle_cancel,
+}
 
 
 def handle_a2a_request(agent_name: str, method: str, data: dict) -> dict:
     """Handle an A2A protocol request."""
-    agent = _agents.get(agent_name)
+    agents = _get_agents()
+    if method == "agent_card":
+        card = _agent_cards_by_name.get(agent_name)
+        return card if card else {"error": f"Unknown agent: {agent_name}"}
+
+    agent = agents.get(agent_name)
     if not agent:
         return {"error": f"Unknown agent: {agent_name}"}
 
-    if method == "agent_card":
-        return agent.get_agent_card()
-    elif method == "tasks/send":
-        task = agent.send_task(data)
-        return task.to_dict()
-    elif method == "tasks/get":
-        task = agent.get_task(data.get("id", ""))
-        return task.to_dict() if task else {"error": "Task not found"}
-    elif method == "tasks/cancel":
-        task = agent.cancel_task(data.get("id", ""))
-        return task.to_dict() if task else {"error": "Task not found"}
-    else:
+    handler = _METHODS.get(method)
+    if not handler:
         return {"error": f"Unknown method: {method}"}
+    return handler(agent, data)
@@ -11,6 +11,8 @@ class ResearchSessionAdmin(admin.ModelAdmin):
     list_filter = ['status', 'current_phase', 'created_at']
     search_fields = ['research_objective', 'title']
     readonly_fields = ['id', 'created_at', 'updated_at', 'completed_at']
+    list_select_related = ['user']
+    list_per_page = 50
 
 
 @admin.register(Paper)
@@ -18,6 +20,8 @@ class PaperAdmin(admin.ModelAdmin):
     list_display = ['title', 'source', 'published_date', 'is_bookmarked', 'created_at']
     list_filter = ['source', 'is_bookmarked']
     search_fields = ['title', 'abstract']
+    list_per_page = 50
+    show_full_result_count = False
 
 
 @admin.register(AGIEvaluation)
@@ -25,27 +29,36 @@ class AGIEvaluationAdmin(admin.ModelAdmin):
     list_display = ['paper', 'agi_score', 'classification', 'confidence_level', 'created_at']
     list_filter = ['classification', 'confidence_level']
     ordering = ['-agi_score']
+    list_select_related = ['paper']
+    list_per_page = 50
 
 
 @admin.register(AgentLog)
 class AgentLogAdmin(admin.ModelAdmin):
     list_display = ['agent_role', 'level', 'message', 'phase', 'created_at']
     list_filter = ['agent_role', 'level', 'phase']
+    list_per_page = 50
 
 
 @admin.register(ResearchCollection)
 class ResearchCollectionAdmin(admin.ModelAdmin):
     list_display = ['name', 'user', 'is_public', 'created_at']
     list_filter = ['is_public']
+    list_select_related = ['user']
+    list_per_page = 50
 
 
 @admin.register(ScheduledResearch)
 class ScheduledResearchAdmin(admin.ModelAdmin):
     list_display = ['name', 'user', 'frequency', 'is_active', 'last_run_at', 'next_run_at']
     list_filter = ['frequency', 'is_active']
+    list_select_related = ['user']
+    list_per_page = 50
 
 
 @admin.register(ExportRecord)
 class ExportRecordAdmin(admin.ModelAdmin):
     list_display = ['file_name', 'format', 'user', 'created_at']
     list_filter = ['format']
+    list_select_related = ['user']
+    list_per_page = 50
@@ -3,7 +3,7 @@ Configuration for the multi-agent research system.
 """
 import os
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
 
 
 @dataclass
@@ -16,6 +16,21 @@ class AgentConfig:
     request_timeout: int = 120
     retry_delay: int = 5
     openai_model_name: str = "gpt-4o-mini"
+    a2a_max_tasks: int = 10000
+    arxiv_cache_ttl: int = 24 * 3600
+    arxiv_concurrency: int = 1
+    evaluation_concurrency: int = 8
+    evaluation_batch_size: int = 5
+    evaluation_timeout: int = 45
+    eval_cache_ttl: int = 30 * 24 * 3600
+    plan_cache_ttl: int = 24 * 3600
+    # Opt-in: a threshold > 0 embeds each uncached objective (one paid
+    # embeddings request) and reuses the plan of a similar objective from today
+    plan_similarity_threshold: float = 0.0
+    embedding_model_name: str = "text-embedding-3-small"
+    embedding_cache_ttl: int = 30 * 24 * 3600
+    # Opt-in: a threshold > 0 adds one paid embeddings request per run
+    semantic_filter_threshold: float = 0.0
 
     @classmethod
     def from_env(cls) -> "AgentConfig":
@@ -27,17 +42,24 @@ class AgentConfig:
             request_timeout=int(os.getenv("REQUEST_TIMEOUT", "120")),
             retry_delay=int(os.getenv("RETRY_DELAY", "5")),
             openai_model_name=os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini"),
+            a2a_max_tasks=int(os.getenv("A2A_MAX_TASKS", "10000")),
+            arxiv_cache_ttl=int(os.getenv("ARXIV_CACHE_TTL", str(24 * 3600))),
+            arxiv_concurrency=max(1, int(os.getenv("ARXIV_CONCURRENCY", "1"))),
+            evaluation_concurrency=int(os.getenv("EVALUATION_CONCURRENCY", "8")),
+            evaluation_batch_size=max(1, int(os.getenv("EVALUATION_BATCH_SIZE", "5"))),
+            evaluation_timeout=int(os.getenv("EVALUATION_TIMEOUT", "45")),
+            eval_cache_ttl=int(os.getenv("EVAL_CACHE_TTL", str(30 * 24 * 3600))),
+            plan_cache_ttl=int(os.getenv("PLAN_CACHE_TTL", str(24 * 3600))),
+            plan_similarity_threshold=float(os.getenv("PLAN_SIMILARITY_THRESHOLD", "0")),
+            embedding_model_name=os.getenv("EMBEDDING_MODEL_NAME", "text-embedding-3-small"),
+            embedding_cache_ttl=int(os.getenv("EMBEDDING_CACHE_TTL", str(30 * 24 * 3600))),
+            semantic_filter_threshold=float(os.getenv("SEMANTIC_FILTER_THRESHOLD", "0")),
         )
 
 
-_config: Optional[AgentConfig] = None
-
-
+@lru_cache(maxsize=1)
 def get_config() -> AgentConfig:
-    global _config
-    if _config is None:
-        _config = AgentConfig.from_env()
-    return _config
+    return AgentConfig.from_env()
 
 
 # AGI Parameters with weights (must sum to 1.0)
@@ -83,3 +105,8 @@ AGI_PARAMETERS = {
         "description": "Setting and pursuing own objectives",
     },
 }
+
+# Parameter names and weights in a fixed order, for scoring without per-paper
+# dict lookups
+AGI_PARAM_NAMES = tuple(AGI_PARAMETERS)
+AGI_PARAM_WEIGHTS = tuple(AGI_PARAMETERS[name]["weight"] for name in AGI_PARAM_NAMES)
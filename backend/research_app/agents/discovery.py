@@ -1,32 +1,127 @@
 """
 Discovery Agent - Searches academic sources for papers.
 """
-import re
+import sys
 import time
+import threading
+import hashlib
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 import arxiv
+from django.core.cache import cache
+
+from .config import get_config
+from .embeddings import embed_texts
 
 logger = logging.getLogger("research_app.agents.discovery")
 
 
-def search_arxiv(
+@lru_cache(maxsize=64)
+def _category_filter(categories: Tuple[str, ...]) -> str:
+    return " OR ".join(f"cat:{cat}" for cat in categories)
+
+
+class _SharedArxivClient(arxiv.Client):
+    """
+    arxiv.Client that discovery threads can share.
+
+    Page fetches, including arxiv's 3s delay between requests, run one at a
+    time under a lock, so concurrent queries reuse one HTTP session and stay
+    within arXiv's rate limit. The lock is re-entrant because _parse_feed
+    calls itself on retry.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fetch_lock = threading.RLock()
+
+    def _parse_feed(self, *args, **kwargs):
+        with self._fetch_lock:
+            return super()._parse_feed(*args, **kwargs)
+
+
+_client_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _cached_arxiv_client(page_size: int) -> _SharedArxivClient:
+    return _SharedArxivClient(page_size=page_size, num_retries=get_config().max_retries)
+
+
+def _arxiv_client(page_size: int) -> arxiv.Client:
+    # Keeps arxiv's default 3s delay between pages, as arXiv's API terms ask.
+    # The lock stops two threads from each building a client on a cold cache.
+    with _client_lock:
+        return _cached_arxiv_client(page_size)
+
+
+def _result_to_paper(result: arxiv.Result) -> Dict[str, Any]:
+    return {
+        "id": result.get_short_id(),
+        "title": result.title,
+        "link": result.entry_id,
+        "metadata": {
+            # arXiv does not expose affiliations, so store plain names
+            "authors": [author.name for author in result.authors],
+            "abstract": result.summary.replace("\n", " ").strip(),
+            "published_date": result.published.isoformat(),
+            "updated_date": result.updated.isoformat(),
+            "categories": result.categories,
+            "source": "arxiv",
+            "doi": getattr(result, "doi", None),
+            "comment": getattr(result, "comment", None),
+            "journal_ref": getattr(result, "journal_ref", None),
+        },
+    }
+
+
+def _search_cache_key(
+    query: str,
+    max_papers: int,
+    from_date: Optional[str],
+    to_date: Optional[str],
+    categories: Optional[List[str]],
+) -> str:
+    raw = f"{query}|{max_papers}|{from_date}|{to_date}|{','.join(categories or [])}"
+    return "arxiv:" + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _cache_papers(key: str, papers: List[Dict[str, Any]]) -> None:
+    try:
+        cache.set(key, papers, timeout=get_config().arxiv_cache_ttl)
+    except Exception as e:
+        logger.warning(f"Failed to cache arXiv results: {e}")
+
+
+def iter_arxiv(
     query: str,
     max_papers: int = 10,
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
     categories: Optional[List[str]] = None,
-) -> List[Dict[str, Any]]:
-    """Search arXiv for research papers matching the given query."""
+) -> Iterator[Dict[str, Any]]:
+    """Lazily yield arXiv papers matching the given query as they are fetched."""
     logger.info(f"ArXiv search: query={query}, max={max_papers}, from={from_date}, to={to_date}, categories={categories}")
 
+    cache_key = _search_cache_key(query, max_papers, from_date, to_date, categories)
+    try:
+        cached = cache.get(cache_key)
+    except Exception as e:
+        logger.warning(f"ArXiv cache lookup failed: {e}")
+        cached = None
+    if cached is not None:
+        logger.info(f"ArXiv search served from cache: {len(cached)} papers")
+        yield from cached
+        return
+
+    papers = []
     try:
         full_query = f"({query})"
         if categories:
-            category_filter = " OR ".join([f"cat:{cat}" for cat in categories])
-            full_query = f"{full_query} AND ({category_filter})"
+            full_query = f"{full_query} AND ({_category_filter(tuple(categories))})"
 
         if from_date or to_date:
             from_arxiv = (
@@ -49,37 +144,63 @@ def search_arxiv(
             sort_order=arxiv.SortOrder.Descending,
         )
 
-        results = list(search.results())
-        papers = []
-
-        for result in results:
-            paper = {
-                "id": result.get_short_id(),
-                "title": result.title,
-                "link": result.entry_id,
-                "metadata": {
-                    "authors": [
-                        {"name": author.name, "affiliation": ""}
-                        for author in result.authors
-                    ],
-                    "abstract": result.summary.replace("\n", " ").strip(),
-                    "published_date": result.published.isoformat(),
-                    "updated_date": result.updated.isoformat(),
-                    "categories": result.categories,
-                    "source": "arxiv",
-                    "doi": getattr(result, "doi", None),
-                    "comment": getattr(result, "comment", None),
-                    "journal_ref": getattr(result, "journal_ref", None),
-                },
-            }
-            papers.append(paper)
+        client = _arxiv_client(min(max_papers, 100))
+        for result in client.results(search):
+            papers.append(_result_to_paper(result))
+            if len(papers) == max_papers:
+                # The result set is complete; cache it before handing out the
+                # last paper in case the consumer stops iterating there.
+                _cache_papers(cache_key, papers)
+            yield papers[-1]
 
+        if len(papers) < max_papers:
+            _cache_papers(cache_key, papers)
         logger.info(f"ArXiv search completed: {len(papers)} papers found")
-        return papers
 
     except Exception as e:
-        logger.error(f"ArXiv search failed: {e}")
-        return []
+        if papers:
+            # Consumers keep what was already yielded; say how much went missing
+            logger.warning(
+                f"ArXiv search stopped after {len(papers)} of up to {max_papers} papers, "
+                f"returning partial results: {e}"
+            )
+        else:
+            logger.error(f"ArXiv search failed: {e}")
+
+
+def filter_by_semantic_similarity(
+    objective: str,
+    papers: List[Dict[str, Any]],
+    threshold: float,
+    min_keep: int,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Drop papers whose title+abstract embedding is far from the objective.
+
+    OpenAI embeddings are unit length, so the dot product is the cosine
+    similarity. Survivors keep their input order; if fewer than `min_keep`
+    pass, the `min_keep` most similar papers are kept instead. On any
+    embedding failure the papers are returned unfiltered.
+
+    Returns (kept_papers, removed_count).
+    """
+    if not papers:
+        return papers, 0
+    try:
+        texts = [objective] + [
+            f"{p.get('title', '')} {p.get('metadata', {}).get('abstract', '')}" for p in papers
+        ]
+        objective_vec, *paper_vecs = embed_texts(texts)
+    except Exception as e:
+        logger.warning(f"Semantic relevance filter skipped: {e}")
+        return papers, 0
+
+    sims = [sum(a * b for a, b in zip(objective_vec, vec)) for vec in paper_vecs]
+    keep = [i for i, sim in enumerate(sims) if sim >= threshold]
+    if len(keep) < min_keep:
+        keep = sorted(sorted(range(len(papers)), key=sims.__getitem__, reverse=True)[:min_keep])
+
+    return [papers[i] for i in keep], len(papers) - len(keep)
 
 
 def discover_and_process_papers(
@@ -94,33 +215,34 @@ def discover_and_process_papers(
     start_time = time.time()
 
     try:
-        papers = search_arxiv(query, max_papers, from_date, to_date, categories=categories)
-
-        # Deduplicate
-        unique_papers = []
+        # Stream results straight into a single deduplicate/validate pass
+        valid_papers = []
         seen_titles = set()
-        for paper in papers:
-            normalized = re.sub(r"\s+", " ", paper["title"].lower().strip())
-            if normalized not in seen_titles:
-                seen_titles.add(normalized)
-                unique_papers.append(paper)
-
-        # Validate
-        valid_papers = [
-            p
-            for p in unique_papers
-            if p.get("title")
-            and p.get("metadata", {}).get("abstract")
-            and len(p.get("metadata", {}).get("abstract", "")) >= 50
-        ]
+        fetched = duplicates = invalid = 0
+        for paper in iter_arxiv(query, max_papers, from_date, to_date, categories=categories):
+            fetched += 1
+            # split()/join collapses whitespace without a regex pass
+            normalized = sys.intern(" ".join(paper["title"].split()).lower())
+            if normalized in seen_titles:
+                duplicates += 1
+                continue
+            seen_titles.add(normalized)
+
+            abstract = paper.get("metadata", {}).get("abstract", "")
+            if not (paper.get("title") and abstract and len(abstract) >= 50):
+                invalid += 1
+                continue
+            valid_papers.append(paper)
+            if len(valid_papers) >= max_papers:
+                break
 
         processing_time = time.time() - start_time
         statistics = {
-            "initial_count": len(papers),
-            "after_deduplication": len(unique_papers),
+            "initial_count": fetched,
+            "after_deduplication": len(valid_papers) + invalid,
             "final_count": len(valid_papers),
-            "duplicates_removed": len(papers) - len(unique_papers),
-            "invalid_removed": len(unique_papers) - len(valid_papers),
+            "duplicates_removed": duplicates,
+            "invalid_removed": invalid,
             "processing_time": f"{processing_time:.2f}s",
         }
 
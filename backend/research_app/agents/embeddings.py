@@ -0,0 +1,47 @@
+"""
+Embeddings - Cached OpenAI text embeddings shared by the planner and discovery agents.
+"""
+import hashlib
+import logging
+from functools import lru_cache
+from typing import List
+
+from django.core.cache import cache
+from langchain_openai import OpenAIEmbeddings
+
+from .config import get_config
+
+logger = logging.getLogger("research_app.agents.embeddings")
+
+
+@lru_cache(maxsize=1)
+def _get_embeddings() -> OpenAIEmbeddings:
+    config = get_config()
+    return OpenAIEmbeddings(model=config.embedding_model_name, max_retries=config.max_retries)
+
+
+def _embedding_cache_key(model: str, text: str) -> str:
+    return "emb:" + hashlib.blake2b(f"{model}|{text}".encode(), digest_size=16).hexdigest()
+
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed texts in one request, reusing cached vectors where available."""
+    config = get_config()
+    keys = [_embedding_cache_key(config.embedding_model_name, text) for text in texts]
+    try:
+        cached = cache.get_many(keys)
+    except Exception as e:
+        logger.warning(f"Embedding cache lookup failed: {e}")
+        cached = {}
+
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+        vectors = _get_embeddings().embed_documents([texts[i] for i in missing])
+        fresh = {keys[i]: vector for i, vector in zip(missing, vectors)}
+        cached.update(fresh)
+        try:
+            cache.set_many(fresh, timeout=config.embedding_cache_ttl)
+        except Exception as e:
+            logger.warning(f"Failed to cache embeddings: {e}")
+
+    return [cached[key] for key in keys]
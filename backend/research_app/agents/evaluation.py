@@ -2,15 +2,19 @@
 Evaluation Agent - Evaluates papers using the 10-parameter AGI framework.
 """
 import json
+import hashlib
 import logging
-from typing import Dict, List, Any, Tuple
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 
+import tiktoken
+from django.core.cache import cache
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from openai import APIError, RateLimitError, APITimeoutError
 
-from .config import get_config, AGI_PARAMETERS
+from .config import get_config, AGI_PARAM_NAMES, AGI_PARAM_WEIGHTS
 
 logger = logging.getLogger("research_app.agents.evaluation")
 
@@ -31,17 +35,64 @@ def call_llm_with_retry(llm, messages):
         raise
 
 
-def get_agi_metrics_prompt(title: str, abstract: str, authors: List[str]) -> str:
-    authors_str = ", ".join(authors[:5])
-    return f"""EVALUATE THIS RESEARCH PAPER FOR AGI (ARTIFICIAL GENERAL INTELLIGENCE) POTENTIAL
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=60),
+    retry=retry_if_exception_type((APIError, RateLimitError, APITimeoutError)),
+)
+async def acall_llm_with_retry(llm, messages):
+    try:
+        return await llm.ainvoke(messages)
+    except RateLimitError:
+        logger.warning("Rate limit hit, backing off")
+        raise
+    except APITimeoutError:
+        logger.warning("API timeout, retrying")
+        raise
+
+
+# Per-paper output budget: room for ten reasoning strings plus the summary fields.
+_MAX_TOKENS_PER_PAPER = 1200
+_TIMEOUT_PER_PAPER = 30
+
+
+def create_eval_llm(batch_size: int = 1) -> ChatOpenAI:
+    # Single retry layer: tenacity, not the OpenAI client's own retries.
+    return ChatOpenAI(
+        model_name=get_config().openai_model_name,
+        temperature=0.2,
+        max_tokens=_MAX_TOKENS_PER_PAPER * batch_size,
+        timeout=_TIMEOUT_PER_PAPER * batch_size,
+        max_retries=0,
+        # JSON mode: the response is always a single parseable object
+        model_kwargs={"response_format": {"type": "json_object"}},
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_llm() -> ChatOpenAI:
+    return create_eval_llm()
 
-## PAPER DETAILS
-**Title:** {title}
-**Authors:** {authors_str}
-**Abstract:** {abstract}
+
+def _log_token_usage(label: str, response) -> None:
+    usage = (getattr(response, "response_metadata", None) or {}).get("token_usage")
+    if usage:
+        logger.info(
+            f"Token usage for {label}: "
+            f"prompt={usage.get('prompt_tokens')} completion={usage.get('completion_tokens')}"
+        )
+
+
+# The rubric is byte-identical for every paper so it forms a cacheable prompt
+# prefix; only the paper details vary, and they go in the user message.
+AGI_RUBRIC_SYSTEM = """You are an expert AGI evaluator. Analyze research papers for their contribution
+to Artificial General Intelligence advancement. Provide precise, evidence-based
+evaluations in the requested JSON format.
+
+EVALUATE THE RESEARCH PAPER IN THE USER MESSAGE FOR AGI (ARTIFICIAL GENERAL INTELLIGENCE) POTENTIAL
 
 ## EVALUATION TASK
-Rate this paper on each AGI parameter below using a 1-10 scale where:
+Rate the paper on each AGI parameter below using a 1-10 scale where:
 - **1-3:** No/minimal AGI relevance
 - **4-6:** Some AGI potential but limited
 - **7-8:** Strong AGI contribution
@@ -64,61 +115,125 @@ Rate this paper on each AGI parameter below using a 1-10 scale where:
 Provide your evaluation as a JSON object:
 
 ```json
-{{
-    "parameter_scores": {{
-        "novel_problem_solving": {{"score": X, "reasoning": "explanation"}},
-        "few_shot_learning": {{"score": X, "reasoning": "explanation"}},
-        "task_transfer": {{"score": X, "reasoning": "explanation"}},
-        "abstract_reasoning": {{"score": X, "reasoning": "explanation"}},
-        "contextual_adaptation": {{"score": X, "reasoning": "explanation"}},
-        "multi_rule_integration": {{"score": X, "reasoning": "explanation"}},
-        "generalization_efficiency": {{"score": X, "reasoning": "explanation"}},
-        "meta_learning": {{"score": X, "reasoning": "explanation"}},
-        "world_modeling": {{"score": X, "reasoning": "explanation"}},
-        "autonomous_goal_setting": {{"score": X, "reasoning": "explanation"}}
-    }},
+{
+    "parameter_scores": {
+        "novel_problem_solving": {"score": X, "reasoning": "explanation"},
+        "few_shot_learning": {"score": X, "reasoning": "explanation"},
+        "task_transfer": {"score": X, "reasoning": "explanation"},
+        "abstract_reasoning": {"score": X, "reasoning": "explanation"},
+        "contextual_adaptation": {"score": X, "reasoning": "explanation"},
+        "multi_rule_integration": {"score": X, "reasoning": "explanation"},
+        "generalization_efficiency": {"score": X, "reasoning": "explanation"},
+        "meta_learning": {"score": X, "reasoning": "explanation"},
+        "world_modeling": {"score": X, "reasoning": "explanation"},
+        "autonomous_goal_setting": {"score": X, "reasoning": "explanation"}
+    },
     "overall_agi_assessment": "2-3 sentence summary",
     "key_innovations": ["innovation1", "innovation2", "innovation3"],
     "limitations": ["limitation1", "limitation2"],
     "confidence_level": "High/Medium/Low"
-}}
+}
 ```
 
-Be conservative: Reserve high scores (7+) for truly exceptional AGI contributions.
+Be conservative: Reserve high scores (7+) for truly exceptional AGI contributions."""
+
+
+# Prompt budget per paper: abstracts are cut to a fixed token count so every
+# request has a known upper bound, and near-empty abstracts are skipped.
+_MIN_ABSTRACT_TOKENS = 30
+_MAX_ABSTRACT_TOKENS = 800
+_MAX_TITLE_CHARS = 200
+_MAX_AUTHORS = 5
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(get_config().openai_model_name)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _prepare_abstract(abstract: str) -> Optional[str]:
+    """Return the abstract cut to _MAX_ABSTRACT_TOKENS, or None if it is too short to evaluate."""
+    if not abstract:
+        return None
+    encoding = _get_encoding()
+    tokens = encoding.encode(abstract)
+    if len(tokens) < _MIN_ABSTRACT_TOKENS:
+        return None
+    if len(tokens) > _MAX_ABSTRACT_TOKENS:
+        return encoding.decode(tokens[:_MAX_ABSTRACT_TOKENS])
+    return abstract
+
+
+def format_paper_user_msg(title: str, abstract: str, authors: List[str]) -> str:
+    authors_str = ", ".join(authors)
+    return f"""## PAPER DETAILS
+**Title:** {title[:_MAX_TITLE_CHARS]}
+**Authors:** {authors_str}
+**Abstract:** {abstract}
+
 Evaluate the paper now:"""
 
 
-def calculate_agi_score(parameter_scores: Dict[str, float]) -> Tuple[float, Dict[str, Any]]:
-    """Calculate weighted AGI score from individual parameter scores."""
+def format_papers_batch_user_msg(papers: List[Tuple[str, str, List[str]]]) -> str:
+    """Build the user message for evaluating several (title, abstract, authors) at once."""
+    blocks = []
+    for number, (title, abstract, authors) in enumerate(papers, 1):
+        blocks.append(f"""## PAPER {number}
+**Title:** {title[:_MAX_TITLE_CHARS]}
+**Authors:** {", ".join(authors)}
+**Abstract:** {abstract}""")
+    papers_str = "\n\n".join(blocks)
+    return f"""Evaluate each of the following {len(papers)} papers independently.
+Return a single JSON object of the form {{"evaluations": [...]}} containing one
+evaluation per paper in the output format above, each with an added
+"paper_number" field matching the paper's number below.
+
+{papers_str}
+
+Evaluate the papers now:"""
+
+
+def _classify(final_score: float) -> str:
+    if final_score >= 70:
+        return "high"
+    if final_score >= 40:
+        return "medium"
+    return "low"
+
+
+def _weighted_score(scores: Sequence[Optional[float]]) -> Tuple[float, float]:
+    """Return (final_score, total_weight) for scores in AGI_PARAM_NAMES order; None = missing."""
     total_weighted = 0.0
     total_weight = 0.0
-    contributions = {}
-
-    for name, config in AGI_PARAMETERS.items():
-        if name in parameter_scores:
-            score = parameter_scores[name]
-            weight = config["weight"]
-            contribution = score * weight
-            total_weighted += contribution
+    for score, weight in zip(scores, AGI_PARAM_WEIGHTS):
+        if score is not None:
+            total_weighted += score * weight
             total_weight += weight
-            contributions[name] = {
-                "score": score,
-                "weight": weight,
-                "contribution": round(contribution, 1),
-            }
-
     final_score = (total_weighted / total_weight) * 10 if total_weight > 0 else 0.0
+    return final_score, total_weight
 
-    if final_score >= 70:
-        classification = "high"
-    elif final_score >= 40:
-        classification = "medium"
-    else:
-        classification = "low"
+
+def calculate_agi_score(parameter_scores: Dict[str, float]) -> Tuple[float, Dict[str, Any]]:
+    """Calculate weighted AGI score from individual parameter scores."""
+    scores = [parameter_scores.get(name) for name in AGI_PARAM_NAMES]
+    final_score, total_weight = _weighted_score(scores)
+
+    contributions = {
+        name: {
+            "score": score,
+            "weight": weight,
+            "contribution": round(score * weight, 1),
+        }
+        for name, weight, score in zip(AGI_PARAM_NAMES, AGI_PARAM_WEIGHTS, scores)
+        if score is not None
+    }
 
     breakdown = {
         "final_score": round(final_score, 1),
-        "classification": classification,
+        "classification": _classify(final_score),
         "parameter_contributions": contributions,
         "total_weight_used": total_weight,
     }
@@ -126,70 +241,225 @@ def calculate_agi_score(parameter_scores: Dict[str, float]) -> Tuple[float, Dict
     return round(final_score, 1), breakdown
 
 
-def evaluate_paper(paper: Dict[str, Any]) -> Dict[str, Any]:
-    """Evaluate a single paper using the AGI framework."""
-    config = get_config()
-    llm = ChatOpenAI(model_name=config.openai_model_name, temperature=0.2)
-
+def _paper_details(paper: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str, List[str]]:
     title = paper.get("title", "Unknown")
     metadata = paper.get("metadata", {})
     abstract = metadata.get("abstract", "")
-    authors = []
-    for a in metadata.get("authors", []):
-        if isinstance(a, dict):
-            authors.append(a.get("name", "Unknown"))
-        elif isinstance(a, str):
-            authors.append(a)
-
-    if not abstract or len(abstract) < 50:
-        return {"error": "Insufficient abstract content", "paper_id": paper.get("id")}
-
-    prompt = get_agi_metrics_prompt(title, abstract, authors)
-
-    system_msg = SystemMessage(
-        content="You are an expert AGI evaluator. Analyze research papers for their contribution "
-        "to Artificial General Intelligence advancement. Provide precise, evidence-based "
-        "evaluations in the requested JSON format."
-    )
+    return title, metadata, abstract, normalize_authors(metadata)
+
+
+def normalize_authors(metadata: Dict[str, Any], limit: int = _MAX_AUTHORS) -> List[str]:
+    """
+    First `limit` author names from paper metadata.
+
+    Discovery stores plain name strings; older records and external callers
+    may still pass {"name": ...} dicts.
+    """
+    return [
+        a.get("name", "Unknown") if isinstance(a, dict) else a
+        for a in metadata.get("authors", [])[:limit]
+    ]
+
+
+def _build_eval_messages(title: str, abstract: str, authors: List[str]) -> list:
+    return [
+        SystemMessage(content=AGI_RUBRIC_SYSTEM),
+        HumanMessage(content=format_paper_user_msg(title, abstract, authors)),
+    ]
+
+
+def _build_eval_result(
+    paper: Dict[str, Any],
+    title: str,
+    metadata: Dict[str, Any],
+    authors: List[str],
+    eval_text: str,
+) -> Dict[str, Any]:
+    eval_data = extract_json(eval_text)
+    if eval_data is None:
+        return {"error": "No valid JSON in LLM response", "paper_id": paper.get("id")}
+    return _eval_result_from_data(paper, title, metadata, authors, eval_data)
+
+
+_json_decoder = json.JSONDecoder()
+
 
+def extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first JSON object in an LLM response.
+
+    JSON mode makes the whole response an object; otherwise each "{" is
+    tried in turn, so prose or code fences around the object (or stray
+    braces before it) don't hide a complete evaluation.
+    """
     try:
-        response = call_llm_with_retry(llm, [system_msg, HumanMessage(content=prompt)])
-        eval_text = response.content
-
-        json_start = eval_text.find("{")
-        json_end = eval_text.rfind("}") + 1
-        if json_start < 0 or json_end <= json_start:
-            return {"error": "No valid JSON in LLM response", "paper_id": paper.get("id")}
-
-        eval_data = json.loads(eval_text[json_start:json_end])
-
-        param_scores = {}
-        if "parameter_scores" in eval_data:
-            for param, details in eval_data["parameter_scores"].items():
-                if isinstance(details, dict) and "score" in details:
-                    param_scores[param] = details["score"]
-
-        weighted_score, breakdown = calculate_agi_score(param_scores)
-
-        return {
-            "paper_id": paper.get("id", ""),
-            "paper_title": title,
-            "paper_authors": authors,
-            "paper_source": metadata.get("source", "unknown"),
-            "paper_url": paper.get("link", ""),
-            "agi_score": weighted_score,
-            "agi_classification": breakdown["classification"],
-            "parameter_scores": eval_data.get("parameter_scores", {}),
-            "overall_assessment": eval_data.get("overall_agi_assessment", ""),
-            "key_innovations": eval_data.get("key_innovations", []),
-            "limitations": eval_data.get("limitations", []),
-            "confidence_level": eval_data.get("confidence_level", "Medium"),
-            "score_breakdown": breakdown,
-        }
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data
+    except ValueError:
+        pass
+
+    start = text.find("{")
+    while start >= 0:
+        try:
+            data, _ = _json_decoder.raw_decode(text, start)
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+        start = text.find("{", start + 1)
+    return None
+
+
+def _eval_result_from_data(
+    paper: Dict[str, Any],
+    title: str,
+    metadata: Dict[str, Any],
+    authors: List[str],
+    eval_data: Dict[str, Any],
+) -> Dict[str, Any]:
+    param_scores = {}
+    if "parameter_scores" in eval_data:
+        for param, details in eval_data["parameter_scores"].items():
+            if isinstance(details, dict) and "score" in details:
+                param_scores[param] = details["score"]
+
+    weighted_score, breakdown = calculate_agi_score(param_scores)
+
+    return {
+        "paper_id": paper.get("id", ""),
+        "paper_title": title,
+        "paper_authors": authors,
+        "paper_source": metadata.get("source", "unknown"),
+        "paper_url": paper.get("link", ""),
+        "agi_score": weighted_score,
+        "agi_classification": breakdown["classification"],
+        "parameter_scores": eval_data.get("parameter_scores", {}),
+        "overall_assessment": eval_data.get("overall_agi_assessment", ""),
+        "key_innovations": eval_data.get("key_innovations", []),
+        "limitations": eval_data.get("limitations", []),
+        "confidence_level": eval_data.get("confidence_level", "Medium"),
+        "score_breakdown": breakdown,
+    }
+
+
+def _response_cache_key(messages: list) -> str:
+    h = hashlib.sha256(get_config().openai_model_name.encode())
+    for message in messages:
+        h.update(b"\0")
+        h.update(message.content.encode())
+    return "llm_eval:" + h.hexdigest()
+
 
-    except json.JSONDecodeError as e:
+def _get_cached_response(key: str) -> Optional[str]:
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"LLM response cache lookup failed: {e}")
+        return None
+
+
+def _cache_response(key: str, eval_text: str) -> None:
+    try:
+        cache.set(key, eval_text, timeout=get_config().eval_cache_ttl)
+    except Exception as e:
+        logger.warning(f"Failed to cache LLM response: {e}")
+
+
+def _evaluation_error(paper: Dict[str, Any], e: Exception) -> Dict[str, Any]:
+    if isinstance(e, json.JSONDecodeError):
         logger.error(f"JSON parse error for paper {paper.get('id')}: {e}")
         return {"error": f"JSON parse error: {e}", "paper_id": paper.get("id")}
+    logger.error(f"Evaluation error for paper {paper.get('id')}: {e}")
+    return {"error": str(e), "paper_id": paper.get("id")}
+
+
+def evaluate_paper(paper: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate a single paper using the AGI framework."""
+    try:
+        title, metadata, abstract, authors = _paper_details(paper)
+        abstract = _prepare_abstract(abstract)
+        if abstract is None:
+            return {"error": "Insufficient abstract content", "paper_id": paper.get("id")}
+
+        messages = _build_eval_messages(title, abstract, authors)
+        cache_key = _response_cache_key(messages)
+        eval_text = _get_cached_response(cache_key)
+        if eval_text is not None:
+            return _build_eval_result(paper, title, metadata, authors, eval_text)
+
+        response = call_llm_with_retry(_get_llm(), messages)
+        _log_token_usage(f"paper {paper.get('id')}", response)
+        result = _build_eval_result(paper, title, metadata, authors, response.content)
+        if "error" not in result:
+            _cache_response(cache_key, response.content)
+        return result
+    except Exception as e:
+        return _evaluation_error(paper, e)
+
+
+async def aevaluate_papers_batch(
+    papers: List[Dict[str, Any]], llm: Optional[ChatOpenAI] = None
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate several papers with a single LLM call.
+
+    Papers with a cached single-paper response are served from the cache and
+    left out of the batch; each fresh evaluation is cached under the same
+    key evaluate_paper would use. Results are returned in input order.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(papers)
+    pending = []
+    for i, paper in enumerate(papers):
+        # A failure here (e.g. in the tokenizer) costs only this paper
+        try:
+            title, metadata, abstract, authors = _paper_details(paper)
+            abstract = _prepare_abstract(abstract)
+            if abstract is None:
+                results[i] = {"error": "Insufficient abstract content", "paper_id": paper.get("id")}
+                continue
+
+            cache_key = _response_cache_key(_build_eval_messages(title, abstract, authors))
+            eval_text = _get_cached_response(cache_key)
+            if eval_text is not None:
+                results[i] = _build_eval_result(paper, title, metadata, authors, eval_text)
+                continue
+        except Exception as e:
+            results[i] = _evaluation_error(paper, e)
+            continue
+        pending.append((i, paper, title, metadata, abstract, authors, cache_key))
+
+    if not pending:
+        return results
+
+    llm = llm or create_eval_llm(len(pending))
+    user_msg = format_papers_batch_user_msg([(p[2], p[4], p[5]) for p in pending])
+    try:
+        response = await acall_llm_with_retry(
+            llm, [SystemMessage(content=AGI_RUBRIC_SYSTEM), HumanMessage(content=user_msg)]
+        )
+        _log_token_usage(f"batch of {len(pending)} papers", response)
+        batch_data = extract_json(response.content) or {}
     except Exception as e:
-        logger.error(f"Evaluation error for paper {paper.get('id')}: {e}")
-        return {"error": str(e), "paper_id": paper.get("id")}
+        for i, paper, *_ in pending:
+            results[i] = _evaluation_error(paper, e)
+        return results
+
+    by_number = {}
+    for entry in batch_data.get("evaluations", []):
+        if isinstance(entry, dict):
+            by_number[str(entry.get("paper_number"))] = entry
+
+    for number, (i, paper, title, metadata, abstract, authors, cache_key) in enumerate(pending, 1):
+        eval_data = by_number.get(str(number))
+        if eval_data is None:
+            results[i] = {"error": "Paper missing from batch LLM response", "paper_id": paper.get("id")}
+            continue
+        try:
+            results[i] = _eval_result_from_data(paper, title, metadata, authors, eval_data)
+        except Exception as e:
+            results[i] = _evaluation_error(paper, e)
+            continue
+        _cache_response(cache_key, json.dumps(eval_data))
+
+    return results
@@ -2,17 +2,25 @@
 Research Pipeline - Orchestrates the multi-agent workflow.
 Implements the LangGraph-style state machine from the notebook.
 """
+import asyncio
+import hashlib
+import heapq
 import logging
 import re
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Callable
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Callable, Optional, Tuple
 from enum import Enum
 
+from asgiref.sync import sync_to_async
+
 from .config import get_config
 from .planner import create_execution_plan
-from .discovery import discover_and_process_papers
-from .evaluation import evaluate_paper
+from .discovery import discover_and_process_papers, filter_by_semantic_similarity
+from .evaluation import aevaluate_papers_batch, create_eval_llm, normalize_authors
 
 logger = logging.getLogger("research_app.agents.pipeline")
 
@@ -81,8 +89,9 @@ def run_pipeline(
 
         # Merge custom keywords
         if custom_keywords:
+            # Order-preserving: planner keywords come first, most specific first
             plan["search_keywords"] = list(
-                set(plan.get("search_keywords", []) + custom_keywords)
+                dict.fromkeys((plan.get("search_keywords") or []) + list(custom_keywords))
             )
 
         result["phases_completed"].append("planning")
@@ -110,6 +119,7 @@ def run_pipeline(
         # to AND-joining keyword phrases for a targeted search
         if not arxiv_queries:
             arxiv_queries = [_build_arxiv_query(keywords, research_objective)]
+        arxiv_queries = list(dict.fromkeys(arxiv_queries))
 
         # Progressive discovery: try targeted queries first, broaden if needed
         # When using planner-generated AND queries, skip category filter (query is specific enough)
@@ -117,18 +127,32 @@ def run_pipeline(
         all_papers = {}
         fetch_per_query = max(max_papers * 2, 20)
 
-        # Round 1: Run planner queries WITHOUT date/category filters (they're already targeted)
-        for i, query in enumerate(arxiv_queries[:4]):
-            log("discovery", f"Running search query {i+1}/{min(len(arxiv_queries), 4)}: {query}")
-            discovery_result = discover_and_process_papers(
+        # Round 1: Run planner queries WITHOUT date/category filters (they're already targeted).
+        # The queries are independent; ARXIV_CONCURRENCY > 1 overlaps them. They
+        # share one arXiv client whose page fetches are serialized with the 3s
+        # delay, so only response parsing actually runs in parallel.
+        round_one = arxiv_queries[:4]
+        for i, query in enumerate(round_one):
+            log("discovery", f"Running search query {i+1}/{len(round_one)}: {query}")
+
+        def search_round_one(query: str) -> Dict[str, Any]:
+            return discover_and_process_papers(
                 query=query,
                 max_papers=fetch_per_query,
                 from_date=None,
                 to_date=None,
                 categories=None,
             )
+
+        concurrency = min(get_config().arxiv_concurrency, len(round_one))
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                discovery_results = list(pool.map(search_round_one, round_one))
+        else:
+            discovery_results = [search_round_one(query) for query in round_one]
+        for discovery_result in discovery_results:
             for paper in discovery_result.get("processed_papers", []):
-                paper_id = paper.get("id", paper.get("title", ""))
+                paper_id = _canonical_paper_id(paper)
                 if paper_id not in all_papers:
                     all_papers[paper_id] = paper
 
@@ -147,28 +171,31 @@ def run_pipeline(
                 categories=search_categories if search_categories else None,
             )
             for paper in discovery_result.get("processed_papers", []):
-                paper_id = paper.get("id", paper.get("title", ""))
+                paper_id = _canonical_paper_id(paper)
                 if paper_id not in all_papers:
                     all_papers[paper_id] = paper
 
-        papers = list(all_papers.values())
+        # Queries can return the same work under different ids (e.g. versions),
+        # so drop repeats by content before any scoring or LLM work
+        papers, duplicates_removed = _dedupe_by_content(all_papers.values())
+        if duplicates_removed:
+            log("discovery", f"Dropped {duplicates_removed} duplicate papers by title and first author")
         log("discovery", f"Total unique papers from all queries: {len(papers)}")
 
         # Build relevance terms from objective, keywords, and required_terms
-        relevance_terms = _extract_relevance_terms(research_objective, keywords)
-        log("discovery", f"Relevance terms: {relevance_terms}")
+        relevance_terms = _extract_relevance_terms(research_objective, tuple(keywords))
+        log("discovery", f"Relevance terms: {list(relevance_terms)}")
 
         # Score papers for relevance
-        scored_papers = []
-        for paper in papers:
-            score = _compute_relevance_score(paper, relevance_terms, required_terms)
-            scored_papers.append((score, paper))
-
-        scored_papers.sort(key=lambda x: x[0], reverse=True)
+        relevance_matcher = _build_relevance_matcher(relevance_terms, tuple(required_terms))
+        scores = [_compute_relevance_score(p, relevance_matcher) for p in papers]
 
-        # Filter: require minimum relevance score (at least one multi-word match)
+        # Filter: require minimum relevance score (at least one multi-word match),
+        # then keep the top max_papers without sorting the whole candidate list
         min_score = 2.0
-        relevant_papers = [p for score, p in scored_papers if score >= min_score][:max_papers]
+        passing = [i for i, score in enumerate(scores) if score >= min_score]
+        top = heapq.nlargest(max_papers, passing, key=scores.__getitem__)
+        relevant_papers = [papers[i] for i in top]
 
         filtered_count = len(papers) - len(relevant_papers)
         if filtered_count > 0:
@@ -176,14 +203,27 @@ def run_pipeline(
 
         if not relevant_papers and papers:
             # Last resort: take top papers by score even if below threshold
-            relevant_papers = [p for _, p in scored_papers[:max(3, max_papers // 3)]]
+            top = heapq.nlargest(max(3, max_papers // 3), range(len(papers)), key=scores.__getitem__)
+            relevant_papers = [papers[i] for i in top]
             log("discovery", f"No papers met relevance threshold, using top {len(relevant_papers)} by best score", level="warning")
 
+        # Cheap embedding check so off-topic abstracts never reach the LLM
+        semantic_filtered = 0
+        threshold = get_config().semantic_filter_threshold
+        if threshold > 0 and relevant_papers:
+            relevant_papers, semantic_filtered = filter_by_semantic_similarity(
+                research_objective, relevant_papers, threshold, min_keep=max(1, max_papers // 2),
+            )
+            if semantic_filtered:
+                log("discovery", f"Filtered out {semantic_filtered} papers below semantic similarity ({threshold})")
+
         papers = relevant_papers
         result["discovered_papers"] = papers
         result["statistics"]["discovery"] = {
             "total_fetched": len(all_papers),
             "relevance_filtered": filtered_count if filtered_count > 0 else 0,
+            "semantic_filtered": semantic_filtered,
+            "duplicates_removed": duplicates_removed,
             "queries_run": min(len(arxiv_queries), 4) + (1 if len(all_papers) < max_papers and keywords else 0),
         }
 
@@ -203,24 +243,50 @@ def run_pipeline(
         total_score = 0
         eval_stats = {"total": len(papers), "success": 0, "failed": 0}
 
-        for i, paper in enumerate(papers):
-            log("evaluation", f"Evaluating paper {i + 1}/{len(papers)}: {paper.get('title', '')[:60]}...")
-
-            eval_result = evaluate_paper(paper)
+        config = get_config()
+        concurrency = config.evaluation_concurrency
+        batch_size = config.evaluation_batch_size
+        log(
+            "evaluation",
+            f"Evaluating {len(papers)} papers ({batch_size} per request, {concurrency} concurrent requests)",
+        )
+        eval_results = asyncio.run(_evaluate_papers(
+            papers, concurrency, batch_size,
+            on_progress=lambda done, total: log(
+                "evaluation", f"Evaluated {done}/{total} papers", papers_evaluated=done,
+            ),
+        ))
+
+        # Scores are reported in one coalesced log entry instead of one per
+        # paper; failures are still logged individually
+        scored_events = []
+        for paper, eval_result in zip(papers, eval_results):
+            if isinstance(eval_result, Exception):
+                eval_result = {"error": str(eval_result), "paper_id": paper.get("id")}
 
             if "error" not in eval_result:
                 evaluation_results.append(eval_result)
                 total_score += eval_result.get("agi_score", 0)
                 eval_stats["success"] += 1
-                log(
-                    "evaluation",
-                    f"Paper scored {eval_result['agi_score']}/100 ({eval_result['agi_classification']})",
-                )
+                scored_events.append({
+                    "paper_id": eval_result.get("paper_id"),
+                    "agi_score": eval_result["agi_score"],
+                    "classification": eval_result["agi_classification"],
+                })
             else:
                 eval_stats["failed"] += 1
                 result["errors"].append(eval_result)
                 log("evaluation", f"Evaluation failed: {eval_result['error']}", level="error")
 
+        if scored_events:
+            log(
+                "evaluation",
+                "Papers scored: " + ", ".join(
+                    f"{e['agi_score']}/100 ({e['classification']})" for e in scored_events
+                ),
+                events=scored_events,
+            )
+
         result["evaluation_results"] = evaluation_results
         result["statistics"]["evaluation"] = eval_stats
 
@@ -252,21 +318,106 @@ def run_pipeline(
         return result
 
 
+async def _evaluate_papers(
+    papers: List[Dict[str, Any]],
+    concurrency: int,
+    batch_size: int,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> list:
+    """
+    Evaluate papers in batches of `batch_size` per LLM call, with at most
+    `concurrency` calls in flight. Results line up with `papers`; a batch
+    that raised or timed out contributes its exception once per paper.
+    `on_progress(done, total)` is called as each batch finishes.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    llm = create_eval_llm(batch_size)
+    batches = [papers[i:i + batch_size] for i in range(0, len(papers), batch_size)]
+
+    done = 0
+
+    async def bounded(batch):
+        nonlocal done
+        async with semaphore:
+            # Deadline covers the LLM call plus its retries, so one stuck
+            # batch fails its own papers instead of stalling the phase
+            timeout = get_config().evaluation_timeout * len(batch)
+            try:
+                batch_result = await asyncio.wait_for(aevaluate_papers_batch(batch, llm), timeout)
+            except TimeoutError:
+                raise TimeoutError(f"Evaluation timed out after {timeout}s")
+        done += len(batch)
+        if on_progress:
+            # The callback may write through the synchronous ORM, which Django
+            # refuses to run inside an event loop, so it runs in a worker thread
+            try:
+                await sync_to_async(on_progress)(done, len(papers))
+            except Exception as e:
+                # A failed progress entry must not fail the batch's papers
+                logger.warning(f"Evaluation progress callback failed: {e}")
+        return batch_result
+
+    batch_results = await asyncio.gather(*(bounded(b) for b in batches), return_exceptions=True)
+
+    results = []
+    for batch, batch_result in zip(batches, batch_results):
+        if isinstance(batch_result, Exception):
+            results.extend([batch_result] * len(batch))
+        else:
+            results.extend(batch_result)
+    return results
+
+
+_ARXIV_VERSION_RE = re.compile(r"v\d+$")
+
+
+def _canonical_paper_id(paper: Dict[str, Any]) -> str:
+    """arXiv id without its version suffix, or the normalized title if there is no id."""
+    paper_id = _ARXIV_VERSION_RE.sub("", paper.get("id") or "")
+    return paper_id or " ".join(paper.get("title", "").split()).lower()
+
+
+def _content_key(paper: Dict[str, Any]) -> bytes:
+    """Hash of the normalized title and first author, stable across paper ids."""
+    title = " ".join(paper.get("title", "").split()).lower()
+    first = normalize_authors(paper.get("metadata", {}), limit=1) or [""]
+    return hashlib.blake2b(f"{title}|{first[0].lower()}".encode(), digest_size=16).digest()
+
+
+def _dedupe_by_content(papers: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """Keep the first paper per content key; returns (papers, duplicates_removed)."""
+    seen = set()
+    deduped = []
+    duplicates = 0
+    for paper in papers:
+        key = _content_key(paper)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        deduped.append(paper)
+    return deduped, duplicates
+
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Words too generic to search or score on, shared by query building and relevance
+_STOP_WORDS = frozenset({
+    "find", "some", "papers", "on", "about", "the", "a", "an", "and", "or",
+    "for", "in", "of", "to", "with", "using", "that", "this", "from", "by",
+    "is", "are", "was", "were", "be", "been", "have", "has", "do", "does",
+    "how", "what", "which", "where", "when", "who", "research", "study",
+    "studies", "paper", "recent", "new", "novel", "based", "related",
+    "system", "systems", "approach", "method",
+})
+
+
 def _build_arxiv_query(keywords: List[str], objective: str) -> str:
     """
     Build a proper ArXiv API query from keywords using AND logic.
     Uses the `all:` field prefix which searches title + abstract + fulltext.
     Multi-word keywords are quoted to match as phrases.
     """
-    stop_words = {
-        "find", "some", "papers", "on", "about", "the", "a", "an", "and", "or",
-        "for", "in", "of", "to", "with", "using", "that", "this", "from", "by",
-        "is", "are", "was", "were", "be", "been", "have", "has", "do", "does",
-        "how", "what", "which", "where", "when", "who", "research", "study",
-        "studies", "paper", "recent", "new", "novel", "based", "related",
-        "system", "systems", "approach", "method",
-    }
-
     # Use planner keywords if available
     query_terms = []
     for kw in keywords:
@@ -281,8 +432,8 @@ def _build_arxiv_query(keywords: List[str], objective: str) -> str:
     # If no keywords from planner, extract from objective
     if not query_terms:
         obj_lower = objective.lower()
-        words = re.findall(r'[a-z]+', obj_lower)
-        meaningful = [w for w in words if w not in stop_words and len(w) > 3]
+        words = _WORD_RE.findall(obj_lower)
+        meaningful = [w for w in words if len(w) > 3 and w not in _STOP_WORDS]
         for w in meaningful[:5]:
             query_terms.append(f"all:{w}")
 
@@ -299,19 +450,13 @@ def _build_arxiv_query(keywords: List[str], objective: str) -> str:
         return f"({core}) OR ({extra})"
 
 
-def _extract_relevance_terms(objective: str, keywords: List[str]) -> List[str]:
+@lru_cache(maxsize=256)
+def _extract_relevance_terms(objective: str, keywords: Tuple[str, ...]) -> Tuple[str, ...]:
     """
     Extract meaningful multi-word and single-word terms from the objective and keywords.
-    Returns a list of lowercase terms ordered by specificity (multi-word first).
+    Returns a tuple of lowercase terms ordered by specificity (multi-word first).
+    Cached, so repeat objectives cost nothing.
     """
-    stop_words = {
-        "find", "some", "papers", "on", "about", "the", "a", "an", "and", "or",
-        "for", "in", "of", "to", "with", "using", "that", "this", "from", "by",
-        "is", "are", "was", "were", "be", "been", "have", "has", "do", "does",
-        "how", "what", "which", "where", "when", "who", "research", "study",
-        "studies", "paper", "recent", "new", "novel", "based", "related",
-    }
-
     terms = []
 
     # Add planner keywords as-is (they're already curated phrases)
@@ -321,61 +466,87 @@ def _extract_relevance_terms(objective: str, keywords: List[str]) -> List[str]:
             terms.append(cleaned)
 
     # Extract meaningful phrases from objective
-    obj_lower = objective.lower()
-    words = re.findall(r'[a-z]+', obj_lower)
-    meaningful_words = [w for w in words if w not in stop_words and len(w) > 2]
+    words = _WORD_RE.findall(objective.lower())
+    meaningful_words = [w for w in words if len(w) > 2 and w not in _STOP_WORDS]
 
-    # Add bigrams from meaningful words
-    for i in range(len(meaningful_words) - 1):
-        bigram = f"{meaningful_words[i]} {meaningful_words[i+1]}"
-        terms.append(bigram)
-
-    # Add individual meaningful words
-    for w in meaningful_words:
-        terms.append(w)
+    # Add bigrams from meaningful words, then the individual words
+    terms.extend(f"{a} {b}" for a, b in zip(meaningful_words, meaningful_words[1:]))
+    terms.extend(meaningful_words)
 
     # Deduplicate while preserving order
-    seen = set()
-    unique_terms = []
-    for t in terms:
-        if t not in seen:
-            seen.add(t)
-            unique_terms.append(t)
+    return tuple(dict.fromkeys(terms))
+
+
+# (pattern, term -> [(length, word count, is_required)] of its prefix terms, gated)
+_RelevanceMatcher = Tuple[Optional[re.Pattern], Dict[str, List[Tuple[int, int, bool]]], bool]
+
 
-    return unique_terms
+@lru_cache(maxsize=256)
+def _build_relevance_matcher(terms: Tuple[str, ...], required_terms: Tuple[str, ...] = ()) -> _RelevanceMatcher:
+    """
+    Precompile the relevance and required terms into a single multi-pattern matcher.
+
+    The regex is a lookahead alternation, longest terms first, so one scan
+    reports the longest term starting at each position of the text. Every
+    other term matching at that position is a prefix of it, so each term
+    also maps to the (length, word count, is_required) of its prefix terms,
+    itself included. Required-only terms get a word count of 0 so they gate
+    without scoring. An empty required term matches everything, so it
+    disables the gate as the plain substring check did.
+    """
+    required = set(rt.lower() for rt in required_terms)
+    gated = bool(required) and "" not in required
+    if not gated:
+        required = set()
+    ranked = set(terms)
+    all_terms = list(dict.fromkeys([*terms, *sorted(required)]))
+    if not all_terms:
+        return None, {}, False
+
+    ordered = sorted(all_terms, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(re.escape(t) for t in ordered) + "))")
+    prefixes = {
+        term: [
+            (len(t), len(t.split()) if t in ranked else 0, t in required)
+            for t in all_terms if term.startswith(t)
+        ]
+        for term in all_terms
+    }
+    return pattern, prefixes, gated
 
 
-def _compute_relevance_score(
-    paper: Dict[str, Any],
-    terms: List[str],
-    required_terms: List[str] = None,
-) -> float:
+def _compute_relevance_score(paper: Dict[str, Any], matcher: _RelevanceMatcher) -> float:
     """
     Compute a relevance score for a paper against the search terms.
-    Higher score = more relevant.
+    Higher score = more relevant; each occurrence of a term adds to the score.
     Multi-word term matches are weighted higher than single-word matches.
-    If required_terms are provided, paper must mention at least one to score > 0.
+    If the matcher has required terms, paper must mention at least one to score > 0.
     """
+    pattern, prefixes, gated = matcher
+    if pattern is None:
+        return 0.0
+
     title = paper.get("title", "").lower()
     abstract = paper.get("metadata", {}).get("abstract", "").lower()
     text = f"{title} {abstract}"
 
-    # Check required terms first — paper must contain at least one
-    if required_terms:
-        has_required = any(rt.lower() in text for rt in required_terms)
-        if not has_required:
-            return 0.0
-
+    # Single pass over the text for both the required-terms gate and the
+    # score; every occurrence counts, title occurrences at a higher weight
     score = 0.0
-    for term in terms:
-        word_count = len(term.split())
-        if term in text:
-            if term in title:
+    required_seen = False
+    title_len = len(title)
+    for match in pattern.finditer(text):
+        start = match.start()
+        for term_len, word_count, is_required in prefixes[match.group(1)]:
+            required_seen = required_seen or is_required
+            if start + term_len <= title_len:
                 # Title matches are worth more
                 score += 3.0 * word_count
             else:
                 score += 1.5 * word_count
 
+    if gated and not required_seen:
+        return 0.0
     return score
 
 
@@ -399,18 +570,45 @@ No papers were discovered for the given research objective.
 """
 
 
+_PAPER_SECTION_TEMPLATE = """### {i}. {title}
+**Authors:** {authors}{ellipsis}
+**AGI Score:** {score}/100 ({classification})
+**Key Innovations:** {innovations}
+**Assessment:** {assessment}
+
+"""
+
+_METHODOLOGY_SECTION = """---
+
+## Scoring Methodology
+
+### AGI Parameters (Weighted):
+1. Novel Problem Solving (15%) | 2. Few-Shot Learning (15%) | 3. Task Transfer (15%)
+4. Abstract Reasoning (12%) | 5. Contextual Adaptation (10%) | 6. Multi-Rule Integration (10%)
+7. Generalization Efficiency (8%) | 8. Meta-Learning (8%) | 9. World Modeling (4%)
+10. Autonomous Goal Setting (3%)
+
+### Score Interpretation:
+- 90-100: Exceptional AGI contribution
+- 70-89: High AGI potential
+- 40-69: Medium AGI potential
+- 0-39: Low AGI potential
+
+---
+"""
+
+
 def _generate_final_report(
     objective: str,
     papers: list,
     evaluations: list,
     avg_score: float,
 ) -> str:
-    sorted_evals = sorted(evaluations, key=lambda x: x.get("agi_score", 0), reverse=True)
-    high = [e for e in sorted_evals if e.get("agi_classification") == "high"]
-    medium = [e for e in sorted_evals if e.get("agi_classification") == "medium"]
-    low = [e for e in sorted_evals if e.get("agi_classification") == "low"]
+    # Only the top five are rendered, and the distribution needs counts only
+    top_evals = heapq.nlargest(5, evaluations, key=lambda x: x.get("agi_score", 0))
+    class_counts = Counter(e.get("agi_classification") for e in evaluations)
 
-    report = f"""# AGI Research Analysis Report
+    parts = [f"""# AGI Research Analysis Report
 
 ## Executive Summary
 
@@ -422,14 +620,14 @@ def _generate_final_report(
 - Average AGI score: {avg_score:.1f}/100
 
 **AGI Potential Distribution:**
-- High AGI Potential: {len(high)} papers
-- Medium AGI Potential: {len(medium)} papers
-- Low AGI Potential: {len(low)} papers
+- High AGI Potential: {class_counts["high"]} papers
+- Medium AGI Potential: {class_counts["medium"]} papers
+- Low AGI Potential: {class_counts["low"]} papers
 
 ## Top-Scoring Papers
 
-"""
-    for i, ev in enumerate(sorted_evals[:5], 1):
+"""]
+    for i, ev in enumerate(top_evals, 1):
         title = ev.get("paper_title", "Unknown")
         authors = ev.get("paper_authors", [])
         score = ev.get("agi_score", 0)
@@ -437,31 +635,17 @@ def _generate_final_report(
         innovations = ev.get("key_innovations", [])
         assessment = ev.get("overall_assessment", "")
 
-        report += f"""### {i}. {title}
-**Authors:** {', '.join(authors[:3])}{'...' if len(authors) > 3 else ''}
-**AGI Score:** {score}/100 ({classification})
-**Key Innovations:** {', '.join(innovations[:3]) if innovations else 'N/A'}
-**Assessment:** {assessment}
-
-"""
-
-    report += f"""---
-
-## Scoring Methodology
-
-### AGI Parameters (Weighted):
-1. Novel Problem Solving (15%) | 2. Few-Shot Learning (15%) | 3. Task Transfer (15%)
-4. Abstract Reasoning (12%) | 5. Contextual Adaptation (10%) | 6. Multi-Rule Integration (10%)
-7. Generalization Efficiency (8%) | 8. Meta-Learning (8%) | 9. World Modeling (4%)
-10. Autonomous Goal Setting (3%)
-
-### Score Interpretation:
-- 90-100: Exceptional AGI contribution
-- 70-89: High AGI potential
-- 40-69: Medium AGI potential
-- 0-39: Low AGI potential
-
----
-*Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
-"""
-    return report
+        parts.append(_PAPER_SECTION_TEMPLATE.format(
+            i=i,
+            title=title,
+            authors=", ".join(authors[:3]),
+            ellipsis="..." if len(authors) > 3 else "",
+            score=score,
+            classification=classification,
+            innovations=", ".join(innovations[:3]) if innovations else "N/A",
+            assessment=assessment,
+        ))
+
+    parts.append(_METHODOLOGY_SECTION)
+    parts.append(f"*Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
+    return "".join(parts)
@@ -1,74 +1,128 @@
 """
 Planner Agent - Creates execution plans for research objectives.
 """
+import hashlib
 import json
 import logging
+from array import array
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
+from django.core.cache import cache
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
+from openai import APIError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, ValidationInfo, field_validator
+from tenacity import RetryError
 
 from .config import get_config
-from .evaluation import call_llm_with_retry
+from .embeddings import embed_texts
+from .evaluation import call_llm_with_retry, extract_json
 
 logger = logging.getLogger("research_app.agents.planner")
 
-PLANNER_SYSTEM_PROMPT = """You are a Research Planning Specialist that creates execution plans for academic paper searches on arXiv.
-
-Create a comprehensive research execution plan based on the given objective. The plan must be highly relevant to the user's specific research topic.
-
-OUTPUT FORMAT: Return a valid JSON object:
-{
-    "search_keywords": ["keyword phrase 1", "keyword phrase 2", ...],
+# Output skeleton shown to the model, serialized compactly once at import
+_PLAN_SKELETON = {
+    "search_keywords": ["keyword phrase 1", "keyword phrase 2"],
     "arxiv_queries": [
-        "all:\\\"reinforcement learning\\\" AND all:\\\"stock trading\\\"",
-        "abs:\\\"algorithmic trading\\\" AND abs:\\\"deep reinforcement learning\\\""
+        'all:"reinforcement learning" AND all:"stock trading"',
+        'abs:"algorithmic trading" AND abs:"deep reinforcement learning"',
     ],
     "search_strategy": {
         "primary_sources": ["arxiv"],
         "categories": ["q-fin.TR", "q-fin.PM", "cs.AI"],
         "date_range": "YYYY-MM-DD to YYYY-MM-DD",
-        "max_papers_per_source": 10
+        "max_papers_per_source": 10,
     },
     "required_terms": ["term1", "term2"],
-    "success_criteria": {
-        "min_papers": 10,
-        "min_high_agi_papers": 2,
-        "quality_threshold": 0.7
-    },
+    "success_criteria": {"min_papers": 10, "min_high_agi_papers": 2, "quality_threshold": 0.7},
     "focus_areas": ["specific area 1", "specific area 2"],
     "exclusions": ["topics to avoid"],
-    "special_instructions": "Any specific guidance"
+    "special_instructions": "Any specific guidance",
 }
 
-GUIDELINES:
-1. Extract 5-10 highly relevant search keyword PHRASES (not single words) that directly match the research objective. E.g. for stock trading with RL, use phrases like "stock trading", "reinforcement learning", "algorithmic trading", "portfolio optimization".
-2. Generate 2-4 arxiv_queries using arXiv query syntax. These are the actual queries sent to arXiv's API.
-   - Use AND between core concepts to ensure papers match ALL key aspects.
-   - Use field prefixes: all: (title+abstract+fulltext), abs: (abstract), ti: (title)
-   - Quote multi-word phrases: all:\"reinforcement learning\" AND all:\"stock trading\"
-   - Good: all:\"stock trading\" AND all:\"reinforcement learning\"
-   - Bad: stock OR trading OR reinforcement OR learning (too broad, matches anything)
-3. Set required_terms: 2-3 terms that a relevant paper MUST mention in its title or abstract. Papers missing ALL required terms will be filtered out.
-4. Choose arXiv categories relevant to the topic (q-fin.* for finance, cs.* for CS, stat.* for statistics, econ.* for economics, etc.). Use an empty list if the topic is broad.
-5. Set appropriate time windows
-6. Focus on 2-5 specific research areas directly related to the objective
 
-IMPORTANT: Keywords, queries, and categories MUST be directly relevant to the user's research objective. Do not default to AI/AGI topics unless the user specifically asks about AI/AGI.
+class _LenientModel(BaseModel):
+    """Null or malformed fields fall back to their defaults instead of failing the whole model."""
+
+    model_config = ConfigDict(extra="allow")
+
+    @field_validator("*", mode="wrap")
+    @classmethod
+    def _default_on_invalid(cls, value: Any, handler, info: ValidationInfo) -> Any:
+        if value is not None:
+            try:
+                return handler(value)
+            except ValidationError:
+                pass
+        return cls.model_fields[info.field_name].get_default(call_default_factory=True)
+
+
+class _SearchStrategy(_LenientModel):
+    primary_sources: List[str] = ["arxiv"]
+    categories: List[str] = []
+    date_range: str = ""
+    max_papers_per_source: int = 10
+
+
+class PlanModel(_LenientModel):
+    """Execution plan as returned by the planner model; unknown keys are kept."""
+
+    search_keywords: List[str] = []
+    arxiv_queries: List[str] = []
+    search_strategy: _SearchStrategy = Field(default_factory=_SearchStrategy)
+    required_terms: List[str] = []
+    success_criteria: Dict[str, Any] = {}
+    focus_areas: List[str] = []
+    exclusions: List[str] = []
+    special_instructions: str = ""
+
 
-Be thorough, specific, and actionable."""
+PLANNER_SYSTEM_PROMPT = f"""You are a Research Planning Specialist creating execution plans for arXiv paper searches. The plan must be highly relevant to the user's specific research objective.
+
+Return a valid JSON object in this format:
+{json.dumps(_PLAN_SKELETON, separators=(",", ":"))}
+
+GUIDELINES:
+1. search_keywords: 5-10 keyword PHRASES (not single words) matching the objective, e.g. "stock trading", "reinforcement learning", "portfolio optimization".
+2. arxiv_queries: 2-4 queries in arXiv syntax, sent as-is to the arXiv API. AND core concepts so papers match all key aspects; field prefixes all: (title+abstract+fulltext), abs: (abstract), ti: (title); quote multi-word phrases. Good: all:"stock trading" AND all:"reinforcement learning". Bad: stock OR trading OR reinforcement OR learning (too broad).
+3. required_terms: 2-3 terms a relevant paper MUST mention in title or abstract; papers missing all of them are filtered out.
+4. categories: relevant arXiv categories (q-fin.* finance, cs.* CS, stat.* statistics, econ.* economics, ...); empty list if the topic is broad.
+5. Set appropriate time windows; focus_areas: 2-5 specific areas directly related to the objective.
+
+IMPORTANT: Keywords, queries and categories MUST be directly relevant to the objective. Do not default to AI/AGI topics unless the user asks about AI/AGI."""
 
 
 def create_execution_plan(research_objective: str, days_lookback: int = 14) -> Dict[str, Any]:
     """Create an execution plan for the research objective."""
     config = get_config()
-    llm = ChatOpenAI(model_name=config.openai_model_name, temperature=0.2)
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_lookback)
     date_range = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
 
+    cache_key = _plan_cache_key(config.openai_model_name, research_objective, days_lookback, end_date)
+    try:
+        cached_plan = cache.get(cache_key)
+    except Exception as e:
+        logger.warning(f"Plan cache lookup failed: {e}")
+        cached_plan = None
+    if cached_plan is not None:
+        logger.info("Execution plan served from cache")
+        return cached_plan
+
+    # Opt-in: paraphrases of an objective planned earlier today reuse that
+    # plan. Only reached on an exact-key miss, so cached plans cost no embedding.
+    index_key = f"plan_index:{config.openai_model_name}:{days_lookback}:{end_date.strftime('%Y-%m-%d')}"
+    objective_vec = None
+    if config.plan_similarity_threshold > 0:
+        similar_plan, objective_vec = _find_similar_plan(
+            index_key, research_objective, config.plan_similarity_threshold
+        )
+        if similar_plan is not None:
+            logger.info("Execution plan served from cache (similar objective)")
+            return similar_plan
+
     user_prompt = f"""Create a detailed execution plan for:
 
 RESEARCH OBJECTIVE: {research_objective}
@@ -84,44 +138,109 @@ Context:
 Generate the execution plan now."""
 
     try:
+        # JSON mode: the response body is the plan object itself
+        llm = ChatOpenAI(
+            model_name=config.openai_model_name,
+            temperature=0.2,
+            model_kwargs={"response_format": {"type": "json_object"}},
+        )
         response = call_llm_with_retry(
             llm,
             [SystemMessage(content=PLANNER_SYSTEM_PROMPT), HumanMessage(content=user_prompt)],
         )
 
-        content = response.content
-        if "```json" in content:
-            json_start = content.find("```json") + 7
-            json_end = content.find("```", json_start)
-            content = content[json_start:json_end]
-
-        plan = json.loads(content.strip())
-
-        if not plan.get("search_strategy", {}).get("date_range"):
-            plan.setdefault("search_strategy", {})["date_range"] = date_range
+        # extract_json still covers fenced or prose-wrapped output from models
+        # without JSON mode; bad individual fields fall back to their defaults
+        plan_data = extract_json(response.content)
+        if plan_data is None:
+            raise ValueError("No valid JSON object in planner response")
+        plan = PlanModel.model_validate(plan_data).model_dump()
+        if not plan["search_strategy"]["date_range"]:
+            plan["search_strategy"]["date_range"] = date_range
 
         logger.info(f"Execution plan created: {len(plan.get('search_keywords', []))} keywords")
+        try:
+            cache.set(cache_key, plan, timeout=config.plan_cache_ttl)
+            if objective_vec is not None:
+                index = cache.get(index_key) or []
+                index.append((array("f", objective_vec), cache_key))
+                cache.set(index_key, index[-_MAX_INDEXED_PLANS:], timeout=config.plan_cache_ttl)
+        except Exception as e:
+            logger.warning(f"Failed to cache execution plan: {e}")
         return plan
 
-    except (json.JSONDecodeError, Exception) as e:
+    except (ValueError, APIError, RetryError) as e:
+        # Unparseable or failed LLM responses: expected, logged without a traceback
         logger.error(f"Plan creation failed: {e}, using default plan derived from objective")
-        # Derive keywords from the research objective itself
-        fallback_keywords = [
-            kw.strip() for kw in research_objective.split()
-            if len(kw.strip()) > 3
-        ][:8]
-        if not fallback_keywords:
-            fallback_keywords = [research_objective[:100]]
-        return {
-            "search_keywords": fallback_keywords,
-            "search_strategy": {
-                "primary_sources": ["arxiv"],
-                "categories": [],
-                "date_range": date_range,
-                "max_papers_per_source": 10,
-            },
-            "success_criteria": {"min_papers": 10, "min_high_agi_papers": 2},
-            "focus_areas": [research_objective[:200]],
-            "exclusions": [],
-            "special_instructions": f"Default plan for: {research_objective}",
-        }
+        return _default_plan(research_objective, date_range)
+    except Exception:
+        # Anything unexpected is logged in full, but a plan failure never
+        # stops the pipeline
+        logger.exception("Unexpected plan creation error, using default plan derived from objective")
+        return _default_plan(research_objective, date_range)
+
+
+def _plan_cache_key(model: str, research_objective: str, days_lookback: int, today: datetime) -> str:
+    # The prompt carries today's date range, so plans are reused within a day only
+    raw = json.dumps(
+        {
+            "model": model,
+            "objective": " ".join(research_objective.split()).lower(),
+            "days": days_lookback,
+            "date": today.strftime("%Y-%m-%d"),
+        },
+        sort_keys=True,
+    )
+    return "plan:" + hashlib.sha256(raw.encode()).hexdigest()
+
+
+# Objectives embedded per (model, lookback, day) for the similarity lookup;
+# float32 arrays keep the cached index small.
+_MAX_INDEXED_PLANS = 50
+
+
+def _find_similar_plan(
+    index_key: str, research_objective: str, threshold: float
+) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+    """
+    Return (cached plan of the most similar indexed objective or None, objective embedding).
+
+    Embeddings are unit length, so the dot product is the cosine similarity.
+    Any failure disables the lookup for this call.
+    """
+    try:
+        objective_vec = embed_texts([research_objective])[0]
+        index = cache.get(index_key) or []
+        best_sim, best_key = max(
+            ((sum(a * b for a, b in zip(objective_vec, vec)), key) for vec, key in index),
+            default=(0.0, None),
+        )
+        if best_key is not None and best_sim >= threshold:
+            return cache.get(best_key), objective_vec
+        return None, objective_vec
+    except Exception as e:
+        logger.warning(f"Similar-plan lookup failed: {e}")
+        return None, None
+
+
+def _default_plan(research_objective: str, date_range: str) -> Dict[str, Any]:
+    # Derive keywords from the research objective itself
+    fallback_keywords = [
+        kw.strip() for kw in research_objective.split()
+        if len(kw.strip()) > 3
+    ][:8]
+    if not fallback_keywords:
+        fallback_keywords = [research_objective[:100]]
+    return {
+        "search_keywords": fallback_keywords,
+        "search_strategy": {
+            "primary_sources": ["arxiv"],
+            "categories": [],
+            "date_range": date_range,
+            "max_papers_per_source": 10,
+        },
+        "success_criteria": {"min_papers": 10, "min_high_agi_papers": 2},
+        "focus_areas": [research_objective[:200]],
+        "exclusions": [],
+        "special_instructions": f"Default plan for: {research_objective}",
+    }
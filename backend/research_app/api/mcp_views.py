@@ -1,11 +1,21 @@
 """
 MCP and A2A protocol API endpoints.
 """
-import json
+import orjson
+from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.response import Response
+
+
+def _json_response(payload, status_code=status.HTTP_200_OK) -> HttpResponse:
+    # Protocol payloads (tool results, reports, leaderboards) are encoded with
+    # orjson, which handles UUIDs and datetimes natively
+    return HttpResponse(
+        orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS),
+        content_type="application/json",
+        status=status_code,
+    )
 
 
 @api_view(['POST'])
@@ -23,11 +33,11 @@ def mcp_endpoint(request):
 
     try:
         result = handle_mcp_request(request.data)
-        return Response(result)
+        return _json_response(result)
     except Exception as e:
-        return Response(
+        return _json_response(
             {"jsonrpc": "2.0", "error": {"code": -32000, "message": str(e)}},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
 
@@ -35,8 +45,8 @@ def mcp_endpoint(request):
 @permission_classes([AllowAny])
 def a2a_agent_cards(request):
     """Return all available A2A agent cards."""
-    from research_app.a2a.protocol import get_agent_cards
-    return Response(get_agent_cards())
+    from research_app.a2a.protocol import get_agent_cards_json
+    return HttpResponse(get_agent_cards_json(), content_type="application/json")
 
 
 @api_view(['GET', 'POST'])
@@ -63,4 +73,4 @@ def a2a_agent(request, agent_name):
         data = request.data.get("data", request.data)
         result = handle_a2a_request(agent_name, method, data)
 
-    return Response(result)
+    return _json_response(result)
@@ -5,7 +5,7 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from research_app.models import (
     ResearchSession, Paper, AGIEvaluation, AgentLog,
-    ResearchCollection, ScheduledResearch, ExportRecord,
+    ResearchCollection, ScheduledResearch, ExportRecord, SESSION_RESULT_FIELDS,
 )
 
 
@@ -25,14 +25,15 @@ class RegisterSerializer(serializers.ModelSerializer):
         fields = ['username', 'email', 'password', 'password_confirm', 'first_name', 'last_name']
 
     def validate(self, data):
-        if data['password'] != data['password_confirm']:
+        # Dropped here so create() receives only User fields
+        if data['password'] != data.pop('password_confirm'):
             raise serializers.ValidationError({'password_confirm': 'Passwords do not match.'})
         return data
 
     def create(self, validated_data):
-        validated_data.pop('password_confirm')
-        user = User.objects.create_user(**validated_data)
-        return user
+        # create_user issues a single INSERT; username uniqueness was already
+        # checked by the field's UniqueValidator.
+        return User.objects.create_user(**validated_data)
 
 
 class AGIEvaluationSerializer(serializers.ModelSerializer):
@@ -72,8 +73,10 @@ class AgentLogSerializer(serializers.ModelSerializer):
 
 
 class ResearchSessionSerializer(serializers.ModelSerializer):
-    papers_count = serializers.IntegerField(source='papers.count', read_only=True)
-    evaluations_count = serializers.IntegerField(source='evaluations.count', read_only=True)
+    # Annotated by the querysets (see views.with_session_counts); the default
+    # covers freshly created, unannotated sessions.
+    papers_count = serializers.IntegerField(read_only=True, default=0)
+    evaluations_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
         model = ResearchSession
@@ -86,6 +89,25 @@ class ResearchSessionSerializer(serializers.ModelSerializer):
         ]
 
 
+class ResearchSessionListSerializer(ResearchSessionSerializer):
+    """Session list rows without the large result payloads."""
+
+    class Meta(ResearchSessionSerializer.Meta):
+        fields = None
+        exclude = SESSION_RESULT_FIELDS
+
+
+class ResearchSessionSummarySerializer(serializers.ModelSerializer):
+    """Lightweight serializer for the dashboard's recent sessions."""
+
+    class Meta:
+        model = ResearchSession
+        fields = [
+            'id', 'title', 'research_objective', 'status', 'created_at',
+            'avg_agi_score', 'total_papers_discovered',
+        ]
+
+
 class ResearchSessionCreateSerializer(serializers.Serializer):
     research_objective = serializers.CharField(max_length=2000)
     title = serializers.CharField(max_length=500, required=False, default='')
@@ -127,10 +149,13 @@ class ScheduledResearchSerializer(serializers.ModelSerializer):
 
 
 class ExportRecordSerializer(serializers.ModelSerializer):
+    # The body itself is served by the exports download action
+    size_bytes = serializers.IntegerField(read_only=True, default=None)
+
     class Meta:
         model = ExportRecord
-        fields = '__all__'
-        read_only_fields = ['id', 'user', 'file_content', 'created_at']
+        fields = ['id', 'session', 'user', 'format', 'file_name', 'size_bytes', 'created_at']
+        read_only_fields = ['id', 'user', 'created_at']
 
 
 class ExportRequestSerializer(serializers.Serializer):
@@ -145,7 +170,7 @@ class DashboardStatsSerializer(serializers.Serializer):
     high_agi_count = serializers.IntegerField()
     medium_agi_count = serializers.IntegerField()
     low_agi_count = serializers.IntegerField()
-    recent_sessions = ResearchSessionSerializer(many=True)
+    recent_sessions = ResearchSessionSummarySerializer(many=True)
     top_papers = PaperListSerializer(many=True)
     score_distribution = serializers.ListField()
     papers_by_source = serializers.ListField()
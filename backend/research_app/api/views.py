@@ -1,12 +1,19 @@
 """
 Views for the AI Research Multi-Agent System API.
 """
-import json
 import csv
+import hashlib
 import io
-from django.db.models import Avg, Count, Q, F
-from django.db.models.functions import TruncDate
+
+import orjson
+from django.db.models import Avg, Count, Max, Q, F, Func, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, TruncDate
+from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from rest_framework import viewsets, generics, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -18,7 +25,8 @@ from research_app.models import (
 from .serializers import (
     UserSerializer, RegisterSerializer,
     ResearchSessionSerializer, ResearchSessionCreateSerializer,
-    ResearchSessionDetailSerializer,
+    ResearchSessionDetailSerializer, ResearchSessionSummarySerializer,
+    ResearchSessionListSerializer,
     PaperSerializer, PaperListSerializer,
     AGIEvaluationSerializer,
     AgentLogSerializer,
@@ -29,6 +37,83 @@ from .serializers import (
 )
 
 
+# "; "-joined author names, computed in Postgres from the authors JSON array
+# (entries are plain names or {"name": ...} objects)
+_AUTHOR_NAMES_SQL = f"""
+    array_to_string(ARRAY(
+        SELECT CASE jsonb_typeof(elem)
+            WHEN 'object' THEN COALESCE(elem->>'name', '')
+            ELSE elem#>>'{{}}'
+        END
+        FROM jsonb_array_elements({Paper._meta.db_table}.authors) AS elem
+    ), '; ')
+"""
+
+
+# Columns read by PaperListSerializer; list querysets load only these
+PAPER_LIST_FIELDS = (
+    'id', 'title', 'authors', 'source', 'url', 'categories',
+    'published_date', 'is_bookmarked',
+    'evaluation__agi_score', 'evaluation__classification',
+)
+
+
+def _session_count(model):
+    # Correlated per-session COUNT; joining papers and evaluations in the
+    # outer query would count over their row product instead
+    counts = (
+        model.objects.filter(session=OuterRef('pk'))
+        .order_by().values('session').annotate(c=Count('pk')).values('c')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def with_session_counts(sessions):
+    """Annotate papers_count/evaluations_count for ResearchSessionSerializer."""
+    return sessions.annotate(
+        papers_count=_session_count(Paper),
+        evaluations_count=_session_count(AGIEvaluation),
+    )
+
+
+def _list_etag(request, stats):
+    # Same user, query string and list statistics (row counts, newest
+    # timestamp) => same page
+    raw = "|".join([
+        str(request.user.pk), request.get_full_path(),
+        *(f"{key}={value}" for key, value in sorted(stats.items())),
+    ])
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _sessions_etag(request, *args, **kwargs):
+    # A running session gains papers and evaluations without touching its
+    # updated_at, so the counts the list shows are part of the tag. Paper ->
+    # evaluation is one-to-one, so the joins add no rows beyond the papers.
+    stats = ResearchSession.objects.filter(user=request.user).aggregate(
+        n=Count('id', distinct=True), last=Max('updated_at'),
+        papers=Count('papers'), evaluations=Count('papers__evaluation'),
+    )
+    return _list_etag(request, stats)
+
+
+def _evaluations_etag(request, *args, **kwargs):
+    # Evaluations are never edited after creation
+    stats = AGIEvaluation.objects.filter(session__user=request.user).aggregate(
+        n=Count('id'), last=Max('created_at'),
+    )
+    return _list_etag(request, stats)
+
+
+def _conditional_list(etag_func):
+    """Conditional GET for a list action: clients always revalidate, and an
+    unchanged list is answered with a 304 before any serialization."""
+    return method_decorator(
+        [cache_control(private=True, no_cache=True), condition(etag_func=etag_func)],
+        name='list',
+    )
+
+
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
@@ -47,17 +132,30 @@ class CurrentUserView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
+@_conditional_list(_sessions_etag)
 class ResearchSessionViewSet(viewsets.ModelViewSet):
     serializer_class = ResearchSessionSerializer
 
     def get_queryset(self):
-        return ResearchSession.objects.filter(user=self.request.user).select_related('user')
+        queryset = with_session_counts(
+            ResearchSession.objects.filter(user=self.request.user).select_related('user')
+        )
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch('papers', queryset=Paper.objects.select_related('evaluation')),
+                'agent_logs',
+            )
+        elif self.action in ('list', 'cancel'):
+            queryset = queryset.without_results()
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'create':
             return ResearchSessionCreateSerializer
         if self.action == 'retrieve':
             return ResearchSessionDetailSerializer
+        if self.action == 'list':
+            return ResearchSessionListSerializer
         return ResearchSessionSerializer
 
     def create(self, request, *args, **kwargs):
@@ -80,7 +178,7 @@ class ResearchSessionViewSet(viewsets.ModelViewSet):
         task = run_research_pipeline.delay(str(session.id))
         session.celery_task_id = task.id
         session.status = ResearchSession.Status.RUNNING
-        session.save()
+        session.save(update_fields=['celery_task_id', 'status', 'updated_at'])
 
         return Response(
             ResearchSessionSerializer(session).data,
@@ -95,7 +193,7 @@ class ResearchSessionViewSet(viewsets.ModelViewSet):
             if session.celery_task_id:
                 app.control.revoke(session.celery_task_id, terminate=True)
             session.status = ResearchSession.Status.CANCELLED
-            session.save()
+            session.save(update_fields=['status', 'updated_at'])
             return Response({'status': 'cancelled'})
         return Response({'error': 'Session is not running'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -116,6 +214,7 @@ class ResearchSessionViewSet(viewsets.ModelViewSet):
             file_name=file_name,
             file_content=content,
         )
+        export_record.size_bytes = len(content.encode())
         return Response(ExportRecordSerializer(export_record).data)
 
     def _generate_export(self, session, export_format):
@@ -127,22 +226,28 @@ class ResearchSessionViewSet(viewsets.ModelViewSet):
                     AGIEvaluation.objects.filter(session=session), many=True
                 ).data,
             }
-            return json.dumps(data, indent=2, default=str)
+            return orjson.dumps(data, default=str).decode()
         elif export_format == 'markdown':
             return session.final_report or 'No report generated.'
         elif export_format == 'csv':
             output = io.StringIO()
             writer = csv.writer(output)
             writer.writerow(['Title', 'Authors', 'Source', 'AGI Score', 'Classification', 'URL'])
-            for paper in session.papers.select_related('evaluation').all():
-                eval_obj = getattr(paper, 'evaluation', None)
+            classification_labels = dict(AGIEvaluation.Classification.choices)
+            rows = session.papers.annotate(
+                author_names=RawSQL(_AUTHOR_NAMES_SQL, ()),
+            ).values_list(
+                'title', 'author_names', 'source',
+                'evaluation__agi_score', 'evaluation__classification', 'url',
+            )
+            for title, author_names, source, agi_score, classification, url in rows:
                 writer.writerow([
-                    paper.title,
-                    '; '.join([a.get('name', '') if isinstance(a, dict) else a for a in paper.authors]),
-                    paper.source,
-                    eval_obj.agi_score if eval_obj else '',
-                    eval_obj.get_classification_display() if eval_obj else '',
-                    paper.url,
+                    title,
+                    author_names,
+                    source,
+                    agi_score if agi_score is not None else '',
+                    classification_labels.get(classification, '') if classification else '',
+                    url,
                 ])
             return output.getvalue()
         return session.final_report or ''
@@ -154,10 +259,18 @@ class PaperViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['title', 'abstract']
     ordering_fields = ['published_date', 'created_at', 'title']
 
+    # Single-column actions: fetch and update just that column, no evaluation join
+    _SINGLE_FIELD_ACTIONS = {'bookmark': 'is_bookmarked', 'notes': 'user_notes'}
+
     def get_queryset(self):
-        return Paper.objects.filter(
-            session__user=self.request.user
-        ).select_related('evaluation')
+        queryset = Paper.objects.filter(session__user=self.request.user)
+        field = self._SINGLE_FIELD_ACTIONS.get(self.action)
+        if field:
+            return queryset.only('id', field)
+        queryset = queryset.select_related('evaluation')
+        if self.action == 'list':
+            queryset = queryset.only(*PAPER_LIST_FIELDS)
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -168,17 +281,18 @@ class PaperViewSet(viewsets.ReadOnlyModelViewSet):
     def bookmark(self, request, pk=None):
         paper = self.get_object()
         paper.is_bookmarked = not paper.is_bookmarked
-        paper.save()
+        paper.save(update_fields=['is_bookmarked'])
         return Response({'is_bookmarked': paper.is_bookmarked})
 
     @action(detail=True, methods=['patch'])
     def notes(self, request, pk=None):
         paper = self.get_object()
         paper.user_notes = request.data.get('notes', '')
-        paper.save()
+        paper.save(update_fields=['user_notes'])
         return Response({'user_notes': paper.user_notes})
 
 
+@_conditional_list(_evaluations_etag)
 class AGIEvaluationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = AGIEvaluationSerializer
     filterset_fields = ['classification', 'session']
@@ -211,7 +325,11 @@ class ResearchCollectionViewSet(viewsets.ModelViewSet):
         return ResearchCollectionSerializer
 
     def get_queryset(self):
-        return ResearchCollection.objects.filter(user=self.request.user).prefetch_related('papers')
+        queryset = ResearchCollection.objects.filter(user=self.request.user)
+        if self.action in ('add_paper', 'remove_paper'):
+            # Membership changes only need the collection row itself
+            return queryset
+        return queryset.prefetch_related('papers')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -248,15 +366,41 @@ class ScheduledResearchViewSet(viewsets.ModelViewSet):
     def toggle(self, request, pk=None):
         scheduled = self.get_object()
         scheduled.is_active = not scheduled.is_active
-        scheduled.save()
+        scheduled.save(update_fields=['is_active'])
         return Response({'is_active': scheduled.is_active})
 
 
+_EXPORT_CONTENT_TYPES = {
+    'json': 'application/json',
+    'csv': 'text/csv',
+    'markdown': 'text/markdown',
+}
+
+
 class ExportRecordViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ExportRecordSerializer
 
     def get_queryset(self):
-        return ExportRecord.objects.filter(user=self.request.user)
+        queryset = ExportRecord.objects.filter(user=self.request.user)
+        if self.action == 'download':
+            return queryset
+        # Metadata only: the size is computed in Postgres, the body stays there
+        return queryset.defer('file_content').annotate(
+            size_bytes=Func(F('file_content'), function='OCTET_LENGTH', output_field=IntegerField()),
+        )
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        export_record = self.get_object()
+        response = HttpResponse(
+            export_record.file_content,
+            content_type=f"{_EXPORT_CONTENT_TYPES.get(export_record.format, 'text/plain')}; charset=utf-8",
+        )
+        response['Content-Disposition'] = f'attachment; filename="{export_record.file_name}"'
+        return response
+
+
+_SCORE_BUCKETS = range(0, 100, 10)
 
 
 class DashboardView(generics.GenericAPIView):
@@ -267,33 +411,38 @@ class DashboardView(generics.GenericAPIView):
         sessions = ResearchSession.objects.filter(user=user)
         evaluations = AGIEvaluation.objects.filter(session__user=user)
 
-        # Aggregate stats
-        total_sessions = sessions.count()
-        total_papers = Paper.objects.filter(session__user=user).count()
-        total_evaluations = evaluations.count()
-
-        agg = evaluations.aggregate(avg_score=Avg('agi_score'))
-        avg_agi_score = round(agg['avg_score'] or 0, 1)
-
-        high_count = evaluations.filter(classification='high').count()
-        medium_count = evaluations.filter(classification='medium').count()
-        low_count = evaluations.filter(classification='low').count()
+        # Aggregate stats: one query for sessions/papers, one for evaluations
+        totals = sessions.aggregate(
+            total_sessions=Count('id', distinct=True),
+            total_papers=Count('papers', distinct=True),
+        )
+        eval_stats = evaluations.aggregate(
+            total=Count('id'),
+            avg_score=Avg('agi_score'),
+            high=Count('id', filter=Q(classification='high')),
+            medium=Count('id', filter=Q(classification='medium')),
+            low=Count('id', filter=Q(classification='low')),
+            **{
+                f'bucket_{lower}': Count('id', filter=Q(agi_score__gte=lower, agi_score__lt=lower + 10))
+                for lower in _SCORE_BUCKETS
+            },
+        )
+        avg_agi_score = round(eval_stats['avg_score'] or 0, 1)
 
         # Recent sessions
-        recent_sessions = sessions[:5]
+        recent_sessions = sessions.only(*ResearchSessionSummarySerializer.Meta.fields)[:5]
 
         # Top papers
         top_papers = Paper.objects.filter(
             session__user=user,
             evaluation__isnull=False,
-        ).select_related('evaluation').order_by('-evaluation__agi_score')[:10]
+        ).select_related('evaluation').only(*PAPER_LIST_FIELDS).order_by('-evaluation__agi_score')[:10]
 
         # Score distribution (buckets of 10)
-        score_distribution = []
-        for lower in range(0, 100, 10):
-            upper = lower + 10
-            count = evaluations.filter(agi_score__gte=lower, agi_score__lt=upper).count()
-            score_distribution.append({'range': f'{lower}-{upper}', 'count': count})
+        score_distribution = [
+            {'range': f'{lower}-{lower + 10}', 'count': eval_stats[f'bucket_{lower}']}
+            for lower in _SCORE_BUCKETS
+        ]
 
         # Papers by source
         papers_by_source = list(
@@ -314,14 +463,14 @@ class DashboardView(generics.GenericAPIView):
         )
 
         data = {
-            'total_sessions': total_sessions,
-            'total_papers': total_papers,
-            'total_evaluations': total_evaluations,
+            'total_sessions': totals['total_sessions'],
+            'total_papers': totals['total_papers'],
+            'total_evaluations': eval_stats['total'],
             'avg_agi_score': avg_agi_score,
-            'high_agi_count': high_count,
-            'medium_agi_count': medium_count,
-            'low_agi_count': low_count,
-            'recent_sessions': ResearchSessionSerializer(recent_sessions, many=True).data,
+            'high_agi_count': eval_stats['high'],
+            'medium_agi_count': eval_stats['medium'],
+            'low_agi_count': eval_stats['low'],
+            'recent_sessions': ResearchSessionSummarySerializer(recent_sessions, many=True).data,
             'top_papers': PaperListSerializer(top_papers, many=True).data,
             'score_distribution': score_distribution,
             'papers_by_source': papers_by_source,
@@ -15,6 +15,10 @@ import json
 import logging
 from typing import Any
 
+from django.core.cache import cache
+
+from research_app.models import AGIEvaluation, ResearchSession
+
 logger = logging.getLogger("research_app.mcp")
 
 
@@ -23,6 +27,7 @@ class MCPToolRegistry:
 
     def __init__(self):
         self.tools = {}
+        self._tool_list = None
 
     def register(self, name: str, description: str, parameters: dict, handler):
         self.tools[name] = {
@@ -31,19 +36,24 @@ class MCPToolRegistry:
             "parameters": parameters,
             "handler": handler,
         }
+        self._tool_list = None
 
     def list_tools(self):
-        return [
-            {
-                "name": t["name"],
-                "description": t["description"],
-                "inputSchema": {
-                    "type": "object",
-                    "properties": t["parameters"],
-                },
-            }
-            for t in self.tools.values()
-        ]
+        # Built once after the last registration and shared by every
+        # tools/list response, so it is a tuple callers cannot grow or reorder
+        if self._tool_list is None:
+            self._tool_list = tuple(
+                {
+                    "name": t["name"],
+                    "description": t["description"],
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": t["parameters"],
+                    },
+                }
+                for t in self.tools.values()
+            )
+        return self._tool_list
 
     def call_tool(self, name: str, arguments: dict) -> Any:
         if name not in self.tools:
@@ -81,13 +91,13 @@ def _create_plan_handler(research_objective: str, days_lookback: int = 14):
 
 
 def _get_session_report_handler(session_id: str):
-    import django
-    django.setup()
-    from research_app.models import ResearchSession
     try:
-        session = ResearchSession.objects.get(id=session_id)
+        session = ResearchSession.objects.only(
+            "id", "status", "final_report",
+            "total_papers_discovered", "total_papers_evaluated", "avg_agi_score",
+        ).get(id=session_id)
         return {
-            "session_id": str(session.id),
+            "session_id": session.id,
             "status": session.status,
             "report": session.final_report,
             "stats": {
@@ -100,20 +110,41 @@ def _get_session_report_handler(session_id: str):
         return {"error": f"Session {session_id} not found"}
 
 
+# The leaderboard spans all sessions; a short TTL keeps repeated calls off the DB
+_LEADERBOARD_CACHE_TTL = 60
+
+
 def _get_leaderboard_handler(limit: int = 20):
-    import django
-    django.setup()
-    from research_app.models import AGIEvaluation
-    evaluations = AGIEvaluation.objects.select_related("paper").order_by("-agi_score")[:limit]
+    cache_key = f"mcp:leaderboard:{limit}"
+    try:
+        cached = cache.get(cache_key)
+    except Exception as e:
+        logger.warning(f"Leaderboard cache lookup failed: {e}")
+        cached = None
+    if cached is not None:
+        return cached
+
+    leaderboard = _build_leaderboard(limit)
+    try:
+        cache.set(cache_key, leaderboard, timeout=_LEADERBOARD_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Failed to cache leaderboard: {e}")
+    return leaderboard
+
+
+def _build_leaderboard(limit: int):
+    rows = AGIEvaluation.objects.order_by("-agi_score").values_list(
+        "paper__title", "agi_score", "classification", "paper__source", "paper__url",
+    )[:limit]
     return [
         {
-            "paper_title": e.paper.title,
-            "agi_score": e.agi_score,
-            "classification": e.classification,
-            "source": e.paper.source,
-            "url": e.paper.url,
+            "paper_title": title,
+            "agi_score": agi_score,
+            "classification": classification,
+            "source": source,
+            "url": url,
         }
-        for e in evaluations
+        for title, agi_score, classification, source, url in rows
     ]
 
 
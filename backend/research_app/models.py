@@ -2,10 +2,23 @@
 Models for the AI Research Multi-Agent System.
 Covers research sessions, papers, evaluations, agent activity, and user management.
 """
+import json
 import uuid
 from django.db import models
+from django.db.models.expressions import RawSQL
 from django.contrib.auth.models import User
 from django.utils import timezone
+from uuid_utils.compat import uuid7
+
+
+# Large result payloads, only needed when a single session is opened or exported
+SESSION_RESULT_FIELDS = ('execution_plan', 'final_report', 'synthesis_data')
+
+
+class ResearchSessionQuerySet(models.QuerySet):
+    def without_results(self):
+        """Defer the large result payloads for queries that never read them."""
+        return self.defer(*SESSION_RESULT_FIELDS)
 
 
 class ResearchSession(models.Model):
@@ -61,6 +74,8 @@ class ResearchSession(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = ResearchSessionQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -72,21 +87,33 @@ class ResearchSession(models.Model):
     def __str__(self):
         return f"[{self.status}] {self.research_objective[:80]}"
 
-    def mark_completed(self):
+    def mark_completed(self, *changed_fields):
+        """Mark the session completed; `changed_fields` are other attributes
+        the caller has set, written in the same UPDATE."""
         self.status = self.Status.COMPLETED
         self.current_phase = self.Phase.COMPLETION
         self.completed_at = timezone.now()
-        self.save()
+        self.save(update_fields=['status', 'current_phase', 'completed_at', 'updated_at', *changed_fields])
 
     def mark_failed(self, error_message: str):
+        now = timezone.now()
+        error = {
+            'message': error_message,
+            'timestamp': now.isoformat(),
+        }
         self.status = self.Status.FAILED
         self.current_phase = self.Phase.FAILED
-        self.errors.append({
-            'message': error_message,
-            'timestamp': timezone.now().isoformat(),
-        })
-        self.completed_at = timezone.now()
-        self.save()
+        self.completed_at = self.updated_at = now
+        # Append in Postgres (jsonb ||) so earlier errors are never read back or rewritten
+        ResearchSession.objects.filter(pk=self.pk).update(
+            status=self.status,
+            current_phase=self.current_phase,
+            completed_at=now,
+            updated_at=now,
+            errors=RawSQL('errors || %s::jsonb', (json.dumps([error]),)),
+        )
+        if 'errors' not in self.get_deferred_fields():
+            self.errors.append(error)
 
 
 class Paper(models.Model):
@@ -99,7 +126,9 @@ class Paper(models.Model):
         SEMANTIC_SCHOLAR = 'semantic_scholar', 'Semantic Scholar'
         MANUAL = 'manual', 'Manual Entry'
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Bulk-inserted in volume, like AGIEvaluation and AgentLog: time-ordered
+    # UUIDv7 keys append at the right edge of the primary key index
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     session = models.ForeignKey(ResearchSession, on_delete=models.CASCADE, related_name='papers')
     external_id = models.CharField(max_length=255, blank=True)
     title = models.TextField()
@@ -143,7 +172,7 @@ class AGIEvaluation(models.Model):
         MEDIUM = 'medium', 'Medium AGI Potential'
         LOW = 'low', 'Low AGI Potential'
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     paper = models.OneToOneField(Paper, on_delete=models.CASCADE, related_name='evaluation')
     session = models.ForeignKey(ResearchSession, on_delete=models.CASCADE, related_name='evaluations')
 
@@ -179,9 +208,10 @@ class AGIEvaluation(models.Model):
 
     class Meta:
         ordering = ['-agi_score']
+        # -agi_score serves the cross-session MCP leaderboard; classification
+        # has three values and is only ever filtered within a user's rows.
         indexes = [
             models.Index(fields=['-agi_score']),
-            models.Index(fields=['classification']),
             models.Index(fields=['session', '-agi_score']),
         ]
 
@@ -206,7 +236,7 @@ class AgentLog(models.Model):
         ERROR = 'error', 'Error'
         DEBUG = 'debug', 'Debug'
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     session = models.ForeignKey(ResearchSession, on_delete=models.CASCADE, related_name='agent_logs')
     agent_role = models.CharField(max_length=30, choices=AgentRole.choices)
     level = models.CharField(max_length=10, choices=LogLevel.choices, default=LogLevel.INFO)
@@ -214,7 +244,8 @@ class AgentLog(models.Model):
     metadata = models.JSONField(default=dict, blank=True)
     phase = models.CharField(max_length=20, blank=True)
     duration_ms = models.IntegerField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is built, not when its buffered batch is inserted
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ['created_at']
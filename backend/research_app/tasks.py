@@ -2,11 +2,31 @@
 Celery tasks for async research pipeline execution.
 """
 import logging
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+import redis
 from celery import shared_task
+from django.db import transaction
 from django.utils import timezone
 
+from research_app.agents.config import AGI_PARAM_NAMES
+
 logger = logging.getLogger("research_app.tasks")
 
+_LOG_BATCH_SIZE = 200
+
+# Interval between runs for each ScheduledResearch frequency
+_RUN_INTERVALS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "biweekly": timedelta(weeks=2),
+    "monthly": timedelta(days=30),
+}
+
 
 @shared_task(bind=True, max_retries=2, soft_time_limit=500, time_limit=600)
 def run_research_pipeline(self, session_id: str):
@@ -18,38 +38,56 @@ def run_research_pipeline(self, session_id: str):
     from research_app.agents.pipeline import run_pipeline
 
     try:
-        session = ResearchSession.objects.get(id=session_id)
+        # Only run configuration and state; result columns are written, never
+        # read, and every save below names its fields.
+        session = ResearchSession.objects.only(
+            "id", "research_objective", "max_papers", "days_lookback",
+            "custom_keywords", "search_categories", "status", "current_phase", "errors",
+        ).get(id=session_id)
     except ResearchSession.DoesNotExist:
         logger.error(f"Session {session_id} not found")
         return {"error": "Session not found"}
 
     session.status = ResearchSession.Status.RUNNING
     session.current_phase = ResearchSession.Phase.INITIALIZATION
-    session.save()
+    session.save(update_fields=["status", "current_phase", "updated_at"])
+
+    phase_map = {
+        "planning": ResearchSession.Phase.PLANNING,
+        "discovery": ResearchSession.Phase.DISCOVERY,
+        "evaluation": ResearchSession.Phase.EVALUATION,
+        "synthesis": ResearchSession.Phase.SYNTHESIS,
+        "completion": ResearchSession.Phase.COMPLETION,
+    }
 
     def on_phase_change(phase: str):
-        phase_map = {
-            "planning": ResearchSession.Phase.PLANNING,
-            "discovery": ResearchSession.Phase.DISCOVERY,
-            "evaluation": ResearchSession.Phase.EVALUATION,
-            "synthesis": ResearchSession.Phase.SYNTHESIS,
-            "completion": ResearchSession.Phase.COMPLETION,
-        }
+        flush_logs()
         session.current_phase = phase_map.get(phase, ResearchSession.Phase.INITIALIZATION)
         session.save(update_fields=["current_phase", "updated_at"])
 
         # Publish to Redis for WebSocket notifications
         _publish_status_update(session_id, phase)
 
+    # Agent logs are buffered and written in batches: at each phase change,
+    # when the buffer fills, and when the run ends.
+    log_buffer = []
+
+    def flush_logs():
+        if log_buffer:
+            AgentLog.objects.bulk_create(log_buffer, batch_size=_LOG_BATCH_SIZE)
+            log_buffer.clear()
+
     def on_log(agent_role: str, message: str, level: str = "info", metadata: dict = None):
-        AgentLog.objects.create(
+        log_buffer.append(AgentLog(
             session=session,
             agent_role=agent_role,
             level=level,
             message=message,
             metadata=metadata or {},
             phase=session.current_phase,
-        )
+        ))
+        if len(log_buffer) >= _LOG_BATCH_SIZE:
+            flush_logs()
 
     try:
         result = run_pipeline(
@@ -61,12 +99,17 @@ def run_research_pipeline(self, session_id: str):
             on_phase_change=on_phase_change,
             on_log=on_log,
         )
+        flush_logs()
 
-        # Save discovered papers
+        # Save discovered papers and their evaluations in one transaction,
+        # two bulk INSERTs; Paper ids are assigned client-side so evaluations
+        # can reference them before the insert.
+        plan = result.get("execution_plan")
+        search_query_used = plan.get("search_keywords", [""])[0] if plan else ""
         papers_map = {}
         for paper_data in result.get("discovered_papers", []):
             metadata = paper_data.get("metadata", {})
-            paper = Paper.objects.create(
+            papers_map[paper_data.get("id", "")] = Paper(
                 session=session,
                 external_id=paper_data.get("id", ""),
                 title=paper_data.get("title", ""),
@@ -76,41 +119,35 @@ def run_research_pipeline(self, session_id: str):
                 url=paper_data.get("link", ""),
                 doi=metadata.get("doi") or "",
                 categories=metadata.get("categories", []),
-                published_date=metadata.get("published_date"),
+                published_date=_parse_datetime(metadata.get("published_date")),
                 journal_ref=metadata.get("journal_ref") or "",
-                search_query_used=result.get("execution_plan", {}).get("search_keywords", [""])[0] if result.get("execution_plan") else "",
+                search_query_used=search_query_used,
             )
-            papers_map[paper_data.get("id", "")] = paper
 
-        # Save evaluations
+        evaluations = []
         for eval_data in result.get("evaluation_results", []):
             paper = papers_map.get(eval_data.get("paper_id"))
             if not paper:
                 continue
 
-            param_scores = eval_data.get("parameter_scores", {})
-            AGIEvaluation.objects.create(
+            scores, reasoning = _split_param_scores(eval_data.get("parameter_scores", {}))
+            evaluations.append(AGIEvaluation(
                 paper=paper,
                 session=session,
                 agi_score=eval_data.get("agi_score", 0),
                 classification=eval_data.get("agi_classification", "low"),
-                novel_problem_solving=_extract_score(param_scores, "novel_problem_solving"),
-                few_shot_learning=_extract_score(param_scores, "few_shot_learning"),
-                task_transfer=_extract_score(param_scores, "task_transfer"),
-                abstract_reasoning=_extract_score(param_scores, "abstract_reasoning"),
-                contextual_adaptation=_extract_score(param_scores, "contextual_adaptation"),
-                multi_rule_integration=_extract_score(param_scores, "multi_rule_integration"),
-                generalization_efficiency=_extract_score(param_scores, "generalization_efficiency"),
-                meta_learning=_extract_score(param_scores, "meta_learning"),
-                world_modeling=_extract_score(param_scores, "world_modeling"),
-                autonomous_goal_setting=_extract_score(param_scores, "autonomous_goal_setting"),
-                parameter_reasoning=_extract_reasoning(param_scores),
+                **scores,
+                parameter_reasoning=reasoning,
                 overall_assessment=eval_data.get("overall_assessment", ""),
                 key_innovations=eval_data.get("key_innovations", []),
                 limitations=eval_data.get("limitations", []),
                 confidence_level=eval_data.get("confidence_level", "Medium"),
                 score_breakdown=eval_data.get("score_breakdown", {}),
-            )
+            ))
+
+        with transaction.atomic():
+            Paper.objects.bulk_create(papers_map.values(), batch_size=500)
+            AGIEvaluation.objects.bulk_create(evaluations, batch_size=500)
 
         # Update session
         session.execution_plan = result.get("execution_plan")
@@ -121,7 +158,11 @@ def run_research_pipeline(self, session_id: str):
         session.avg_agi_score = result.get("statistics", {}).get("avg_agi_score")
         session.processing_time_seconds = result.get("statistics", {}).get("processing_time")
         session.errors = result.get("errors", [])
-        session.mark_completed()
+        session.mark_completed(
+            "execution_plan", "final_report", "synthesis_data",
+            "total_papers_discovered", "total_papers_evaluated", "avg_agi_score",
+            "processing_time_seconds", "errors",
+        )
 
         _publish_status_update(session_id, "completed")
 
@@ -135,37 +176,59 @@ def run_research_pipeline(self, session_id: str):
 
     except Exception as e:
         logger.error(f"Pipeline failed for session {session_id}: {e}")
+        try:
+            flush_logs()
+        except Exception as flush_error:
+            logger.warning(f"Failed to save buffered agent logs: {flush_error}")
         session.mark_failed(str(e))
         _publish_status_update(session_id, "failed")
         raise self.retry(exc=e, countdown=30)
 
 
-def _extract_score(param_scores: dict, key: str) -> float:
-    val = param_scores.get(key, {})
-    if isinstance(val, dict):
-        return float(val.get("score", 0))
-    return float(val) if val else 0
+@lru_cache(maxsize=1024)
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp once per distinct string; papers often share dates."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        logger.warning(f"Unparseable published date: {value!r}")
+        return None
 
 
-def _extract_reasoning(param_scores: dict) -> dict:
+def _split_param_scores(param_scores: dict) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """
+    Split evaluator parameter output into model score fields and reasoning, in one pass.
+
+    Entries are {"score": x, "reasoning": "..."} dicts or bare scores; missing
+    parameters score 0. Reasoning is kept for every key that has it.
+    """
+    scores = dict.fromkeys(AGI_PARAM_NAMES, 0.0)
     reasoning = {}
     for key, val in param_scores.items():
-        if isinstance(val, dict) and "reasoning" in val:
-            reasoning[key] = val["reasoning"]
-    return reasoning
+        if isinstance(val, dict):
+            if key in scores:
+                scores[key] = float(val.get("score", 0))
+            if "reasoning" in val:
+                reasoning[key] = val["reasoning"]
+        elif key in scores and val:
+            scores[key] = float(val)
+    return scores, reasoning
+
+
+@lru_cache(maxsize=1)
+def _redis_client() -> redis.Redis:
+    # One client per worker process; its connection pool is reused by every publish
+    return redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
 
 
 def _publish_status_update(session_id: str, phase: str):
     """Publish a status update to Redis for WebSocket consumers."""
     try:
-        import redis
-        import json
-        import os
-
-        r = redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
-        r.publish(
+        _redis_client().publish(
             "research_updates",
-            json.dumps({
+            orjson.dumps({
                 "type": "session_update",
                 "session_id": session_id,
                 "phase": phase,
@@ -182,37 +245,43 @@ def run_scheduled_research():
     from research_app.models import ScheduledResearch, ResearchSession
 
     now = timezone.now()
-    due_jobs = ScheduledResearch.objects.filter(
+    due_jobs = list(ScheduledResearch.objects.filter(
         is_active=True,
         next_run_at__lte=now,
-    )
-
-    for job in due_jobs:
-        session = ResearchSession.objects.create(
-            user=job.user,
-            title=f"[Scheduled] {job.name}",
-            research_objective=job.research_objective,
-            max_papers=job.max_papers,
-            status=ResearchSession.Status.PENDING,
-        )
+    ))
 
-        task = run_research_pipeline.delay(str(session.id))
-        session.celery_task_id = task.id
-        session.status = ResearchSession.Status.RUNNING
-        session.save()
-
-        job.last_run_at = now
-        job.total_runs += 1
-
-        # Calculate next run
-        from datetime import timedelta
-        freq_map = {
-            "daily": timedelta(days=1),
-            "weekly": timedelta(weeks=1),
-            "biweekly": timedelta(weeks=2),
-            "monthly": timedelta(days=30),
-        }
-        job.next_run_at = now + freq_map.get(job.frequency, timedelta(weeks=1))
-        job.save()
+    # Each job's schedule is advanced only once its task is enqueued, and the
+    # launched jobs are written even if a later job raises, so the next beat
+    # tick neither skips nor re-launches them.
+    launched = []
+    try:
+        for job in due_jobs:
+            session = ResearchSession.objects.create(
+                user_id=job.user_id,
+                title=f"[Scheduled] {job.name}",
+                research_objective=job.research_objective,
+                max_papers=job.max_papers,
+                status=ResearchSession.Status.PENDING,
+            )
+            try:
+                task = run_research_pipeline.delay(str(session.id))
+            except Exception as e:
+                logger.error(f"Failed to enqueue scheduled research {job.id}: {e}")
+                session.mark_failed(f"Failed to enqueue research task: {e}")
+                continue
+            session.celery_task_id = task.id
+            session.status = ResearchSession.Status.RUNNING
+            session.save(update_fields=["celery_task_id", "status", "updated_at"])
+
+            job.last_run_at = now
+            job.total_runs += 1
+
+            # Calculate next run
+            job.next_run_at = now + _RUN_INTERVALS.get(job.frequency, timedelta(weeks=1))
+            launched.append(job)
+    finally:
+        ScheduledResearch.objects.bulk_update(
+            launched, ["last_run_at", "total_runs", "next_run_at"], batch_size=500
+        )
 
-    return f"Launched {due_jobs.count()} scheduled research jobs"
+    return f"Launched {len(launched)} scheduled research jobs"
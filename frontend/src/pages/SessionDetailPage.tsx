@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import { sessionsAPI } from '../services/api';
+import { sessionsAPI, exportsAPI } from '../services/api';
 import { ResearchSession, AgentLog } from '../types';
 import StatusBadge from '../components/StatusBadge';
 import wsService from '../services/websocket';
@@ -63,8 +63,8 @@ export default function SessionDetailPage() {
     try {
       const res = await sessionsAPI.export(id, format);
       // Create download
-      const blob = new Blob([res.data.file_content], { type: 'text/plain' });
-      const url = URL.createObjectURL(blob);
+      const file = await exportsAPI.download(res.data.id);
+      const url = URL.createObjectURL(file.data);
       const a = document.createElement('a');
       a.href = url;
       a.download = res.data.file_name;
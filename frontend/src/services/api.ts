@@ -71,6 +71,11 @@ export const sessionsAPI = {
   logs: (id: string) => api.get(`/sessions/${id}/logs/`),
 };
 
+// Exports
+export const exportsAPI = {
+  download: (id: string) => api.get(`/exports/${id}/download/`, { responseType: 'blob' }),
+};
+
 // Papers
 export const papersAPI = {
   list: (params?: Record<string, any>) => api.get('/papers/', { params }),
@@ -35,6 +35,11 @@ export interface ResearchSession {
   agent_logs?: AgentLog[];
 }
 
+export type ResearchSessionSummary = Pick<
+  ResearchSession,
+  'id' | 'title' | 'research_objective' | 'status' | 'created_at' | 'avg_agi_score' | 'total_papers_discovered'
+>;
+
 export interface Paper {
   id: string;
   session: string;
@@ -100,7 +105,7 @@ export interface DashboardStats {
   high_agi_count: number;
   medium_agi_count: number;
   low_agi_count: number;
-  recent_sessions: ResearchSession[];
+  recent_sessions: ResearchSessionSummary[];
   top_papers: Paper[];
   score_distribution: Array<{ range: string; count: number }>;
   papers_by_source: Array<{ source: string; count: number }>;
@@ -8,6 +8,7 @@ from pptx.enum.shapes import MSO_SHAPE
 prs = Presentation()
 prs.slide_width = Inches(13.333)
 prs.slide_height = Inches(7.5)
+BLANK_LAYOUT = prs.slide_layouts[6]
 
 # Color palette
 DARK_BG = RGBColor(0x1a, 0x1a, 0x2e)
@@ -21,6 +22,13 @@ ACCENT_ORANGE = RGBColor(0xFF, 0x98, 0x00)
 ACCENT_PURPLE = RGBColor(0x9C, 0x27, 0xB0)
 ACCENT_RED = RGBColor(0xE9, 0x1E, 0x63)
 ACCENT_TEAL = RGBColor(0x00, 0x96, 0x88)
+ACCENT_SKY = RGBColor(0x19, 0x76, 0xD2)
+ITEM_BG = RGBColor(0x22, 0x33, 0x55)
+PANEL_BG = RGBColor(0x1a, 0x25, 0x40)
+
+# Inner padding of every add_box card
+BOX_MARGIN_X = Pt(8)
+BOX_MARGIN_Y = Pt(4)
 
 def add_bg(slide, color=DARK_BG):
     bg = slide.background
@@ -28,6 +36,23 @@ def add_bg(slide, color=DARK_BG):
     fill.solid()
     fill.fore_color.rgb = color
 
+def style_paragraph(p, font_size, color=TEXT_WHITE, bold=None, align=None):
+    font = p.font
+    font.size = Pt(font_size)
+    font.color.rgb = color
+    if bold is not None:
+        font.bold = bold
+    if align is not None:
+        p.alignment = align
+
+def add_lines(tf, lines, font_size=10, color=TEXT_LIGHT, space_before=2):
+    """Write one styled paragraph per line, starting in the frame's empty first paragraph."""
+    for i, line in enumerate(lines):
+        p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+        p.text = line
+        style_paragraph(p, font_size, color)
+        p.space_before = Pt(space_before)
+
 def add_box(slide, left, top, width, height, fill_color, text="", font_size=10, bold=False, align=PP_ALIGN.LEFT, border_color=None):
     shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height)
     shape.fill.solid()
@@ -39,17 +64,12 @@ def add_box(slide, left, top, width, height, fill_color, text="", font_size=10,
         shape.line.fill.background()
     tf = shape.text_frame
     tf.word_wrap = True
-    tf.margin_left = Pt(8)
-    tf.margin_right = Pt(8)
-    tf.margin_top = Pt(4)
-    tf.margin_bottom = Pt(4)
+    tf.margin_left = tf.margin_right = BOX_MARGIN_X
+    tf.margin_top = tf.margin_bottom = BOX_MARGIN_Y
     if text:
         p = tf.paragraphs[0]
         p.text = text
-        p.font.size = Pt(font_size)
-        p.font.color.rgb = TEXT_WHITE
-        p.font.bold = bold
-        p.alignment = align
+        style_paragraph(p, font_size, TEXT_WHITE, bold, align)
     return shape
 
 def add_text(slide, left, top, width, height, text, font_size=12, bold=False, color=TEXT_WHITE, align=PP_ALIGN.LEFT):
@@ -58,10 +78,7 @@ def add_text(slide, left, top, width, height, text, font_size=12, bold=False, co
     tf.word_wrap = True
     p = tf.paragraphs[0]
     p.text = text
-    p.font.size = Pt(font_size)
-    p.font.color.rgb = color
-    p.font.bold = bold
-    p.alignment = align
+    style_paragraph(p, font_size, color, bold, align)
     return txBox
 
 def add_arrow(slide, x1, y1, x2, y2, color=ACCENT_CYAN):
@@ -70,7 +87,7 @@ def add_arrow(slide, x1, y1, x2, y2, color=ACCENT_CYAN):
     connector.line.width = Pt(2)
 
 # ==================== SLIDE 1: Title ====================
-slide1 = prs.slides.add_slide(prs.slide_layouts[6])  # Blank
+slide1 = prs.slides.add_slide(BLANK_LAYOUT)
 add_bg(slide1)
 
 add_text(slide1, Inches(1), Inches(1.5), Inches(11), Inches(1),
@@ -96,7 +113,7 @@ add_text(slide1, Inches(1), Inches(6), Inches(11), Inches(0.5),
          font_size=13, color=TEXT_LIGHT, align=PP_ALIGN.CENTER)
 
 # ==================== SLIDE 2: System Architecture ====================
-slide2 = prs.slides.add_slide(prs.slide_layouts[6])
+slide2 = prs.slides.add_slide(BLANK_LAYOUT)
 add_bg(slide2)
 
 add_text(slide2, Inches(0.5), Inches(0.2), Inches(12), Inches(0.5),
@@ -135,7 +152,7 @@ layers = [
         ("OpenAI API", "GPT-4o-mini\nLLM Calls"),
         ("ArXiv API", "Paper Search\nexport.arxiv.org"),
     ]),
-    ("DATA LAYER", Inches(6.7), RGBColor(0x19, 0x76, 0xD2), [
+    ("DATA LAYER", Inches(6.7), ACCENT_SKY, [
         ("PostgreSQL 16", ":5445\n8 Tables"),
         ("Redis 7", ":6345\nQueue + Cache"),
         ("Docker Volumes", "pgdata\nstaticfiles"),
@@ -149,7 +166,7 @@ for label, y, color, items in layers:
     item_w = Inches((10.5) / len(items))
     for i, (title, desc) in enumerate(items):
         x = Inches(2.0 + i * (10.5 / len(items)))
-        box = add_box(slide2, x, y, item_w - Inches(0.1), Inches(0.9), RGBColor(0x22, 0x33, 0x55), border_color=color)
+        box = add_box(slide2, x, y, item_w - Inches(0.1), Inches(0.9), ITEM_BG, border_color=color)
         tf = box.text_frame
         tf.paragraphs[0].text = title
         tf.paragraphs[0].font.size = Pt(10)
@@ -161,7 +178,7 @@ for label, y, color, items in layers:
         p2.font.color.rgb = TEXT_LIGHT
 
 # ==================== SLIDE 3: Agent Pipeline ====================
-slide3 = prs.slides.add_slide(prs.slide_layouts[6])
+slide3 = prs.slides.add_slide(BLANK_LAYOUT)
 add_bg(slide3)
 
 add_text(slide3, Inches(0.5), Inches(0.2), Inches(12), Inches(0.5),
@@ -169,27 +186,33 @@ add_text(slide3, Inches(0.5), Inches(0.2), Inches(12), Inches(0.5),
 
 # Pipeline phases
 phases = [
-    ("1. PLANNING", "Planner Agent", "GPT-4o-mini generates:\n- Search keywords\n- ArXiv queries (AND logic)\n- Required terms\n- Category selection\n- Focus areas", RGBColor(0x15, 0x65, 0xC0)),
-    ("2. DISCOVERY", "Discovery Agent", "ArXiv API search:\n- Multiple targeted queries\n- Relevance sort\n- Progressive broadening\n- Deduplication\n- Relevance scoring & filter", RGBColor(0x2E, 0x7D, 0x32)),
-    ("3. EVALUATION", "Evaluation Agent", "10-Parameter AGI scoring:\n- LLM scores each paper\n- Weighted average (1-100)\n- Classification: High/Med/Low\n- Key innovations\n- Limitations analysis", RGBColor(0xE6, 0x51, 0x00)),
-    ("4. SYNTHESIS", "Synthesis Agent", "Report generation:\n- Executive summary\n- Paper rankings\n- Score distribution\n- Methodology docs\n- Markdown export", RGBColor(0x88, 0x0E, 0x4F)),
+    ("1. PLANNING", "Planner Agent", (
+        "GPT-4o-mini generates:", "- Search keywords", "- ArXiv queries (AND logic)",
+        "- Required terms", "- Category selection", "- Focus areas",
+    ), RGBColor(0x15, 0x65, 0xC0)),
+    ("2. DISCOVERY", "Discovery Agent", (
+        "ArXiv API search:", "- Multiple targeted queries", "- Relevance sort",
+        "- Progressive broadening", "- Deduplication", "- Relevance scoring & filter",
+    ), RGBColor(0x2E, 0x7D, 0x32)),
+    ("3. EVALUATION", "Evaluation Agent", (
+        "10-Parameter AGI scoring:", "- LLM scores each paper", "- Weighted average (1-100)",
+        "- Classification: High/Med/Low", "- Key innovations", "- Limitations analysis",
+    ), RGBColor(0xE6, 0x51, 0x00)),
+    ("4. SYNTHESIS", "Synthesis Agent", (
+        "Report generation:", "- Executive summary", "- Paper rankings",
+        "- Score distribution", "- Methodology docs", "- Markdown export",
+    ), RGBColor(0x88, 0x0E, 0x4F)),
 ]
 
-for i, (phase, agent, desc, color) in enumerate(phases):
+for i, (phase, agent, desc_lines, color) in enumerate(phases):
     x = Inches(0.5 + i * 3.2)
     # Phase header
     add_box(slide3, x, Inches(1.0), Inches(3.0), Inches(0.5), color, phase, font_size=14, bold=True, align=PP_ALIGN.CENTER)
-    add_box(slide3, x, Inches(1.5), Inches(3.0), Inches(0.35), RGBColor(0x22, 0x33, 0x55), agent, font_size=11, bold=True, align=PP_ALIGN.CENTER, border_color=color)
+    add_box(slide3, x, Inches(1.5), Inches(3.0), Inches(0.35), ITEM_BG, agent, font_size=11, bold=True, align=PP_ALIGN.CENTER, border_color=color)
     # Description
-    box = add_box(slide3, x, Inches(1.9), Inches(3.0), Inches(2.5), RGBColor(0x1a, 0x25, 0x40), border_color=color)
+    box = add_box(slide3, x, Inches(1.9), Inches(3.0), Inches(2.5), PANEL_BG, border_color=color)
     tf = box.text_frame
-    tf.paragraphs[0].text = ""
-    for line in desc.split("\n"):
-        p = tf.add_paragraph()
-        p.text = line
-        p.font.size = Pt(10)
-        p.font.color.rgb = TEXT_LIGHT
-        p.space_before = Pt(2)
+    add_lines(tf, desc_lines, space_before=2)
 
 # Arrow connectors between phases
 for i in range(3):
@@ -208,13 +231,17 @@ params = [
     ("Generalization Efficiency", "8%"), ("Meta-Learning", "8%"), ("World Modeling", "4%"),
     ("Autonomous Goal Setting", "3%"),
 ]
+# Border color per parameter, grouped by weight tier
+param_borders = (
+    ACCENT_GREEN, ACCENT_GREEN, ACCENT_GREEN, ACCENT_CYAN, ACCENT_ORANGE,
+    ACCENT_ORANGE, ACCENT_PURPLE, ACCENT_PURPLE, TEXT_LIGHT, TEXT_LIGHT,
+)
 for i, (name, weight) in enumerate(params):
     row = i // 5
     col = i % 5
     x = Inches(0.5 + col * 2.5)
     y = Inches(5.1 + row * 0.55)
-    colors = [ACCENT_GREEN, ACCENT_GREEN, ACCENT_GREEN, ACCENT_CYAN, ACCENT_ORANGE, ACCENT_ORANGE, ACCENT_PURPLE, ACCENT_PURPLE, TEXT_LIGHT, TEXT_LIGHT]
-    add_box(slide3, x, y, Inches(2.3), Inches(0.45), RGBColor(0x22, 0x33, 0x55), f"{name} ({weight})", font_size=9, bold=False, align=PP_ALIGN.CENTER, border_color=colors[i])
+    add_box(slide3, x, y, Inches(2.3), Inches(0.45), ITEM_BG, f"{name} ({weight})", font_size=9, bold=False, align=PP_ALIGN.CENTER, border_color=param_borders[i])
 
 # Score interpretation
 add_text(slide3, Inches(0.5), Inches(6.3), Inches(12), Inches(0.3),
@@ -222,7 +249,7 @@ add_text(slide3, Inches(0.5), Inches(6.3), Inches(12), Inches(0.3),
          font_size=11, color=TEXT_LIGHT, align=PP_ALIGN.CENTER)
 
 # ==================== SLIDE 4: Tech Stack ====================
-slide4 = prs.slides.add_slide(prs.slide_layouts[6])
+slide4 = prs.slides.add_slide(BLANK_LAYOUT)
 add_bg(slide4)
 
 add_text(slide4, Inches(0.5), Inches(0.2), Inches(12), Inches(0.5),
@@ -284,15 +311,9 @@ stacks = [
 for i, (title, color, items) in enumerate(stacks):
     x = Inches(0.3 + i * 2.6)
     add_box(slide4, x, Inches(0.9), Inches(2.4), Inches(0.45), color, title, font_size=14, bold=True, align=PP_ALIGN.CENTER)
-    box = add_box(slide4, x, Inches(1.4), Inches(2.4), Inches(4.2), RGBColor(0x1a, 0x25, 0x40), border_color=color)
+    box = add_box(slide4, x, Inches(1.4), Inches(2.4), Inches(4.2), PANEL_BG, border_color=color)
     tf = box.text_frame
-    tf.paragraphs[0].text = ""
-    for item in items:
-        p = tf.add_paragraph()
-        p.text = f"  {item}"
-        p.font.size = Pt(10)
-        p.font.color.rgb = TEXT_LIGHT
-        p.space_before = Pt(6)
+    add_lines(tf, [f"  {item}" for item in items], space_before=6)
 
 # Docker ports table
 add_text(slide4, Inches(0.5), Inches(5.8), Inches(12), Inches(0.4),
@@ -300,7 +321,7 @@ add_text(slide4, Inches(0.5), Inches(5.8), Inches(12), Inches(0.4),
          font_size=12, color=ACCENT_CYAN, align=PP_ALIGN.CENTER)
 
 # ==================== SLIDE 5: Data Flow ====================
-slide5 = prs.slides.add_slide(prs.slide_layouts[6])
+slide5 = prs.slides.add_slide(BLANK_LAYOUT)
 add_bg(slide5)
 
 add_text(slide5, Inches(0.5), Inches(0.2), Inches(12), Inches(0.5),
@@ -316,7 +337,7 @@ steps = [
     ("7", "Redis publishes\nphase updates", ACCENT_RED),
     ("8", "Gateway broadcasts\nvia WebSocket", ACCENT_ORANGE),
     ("9", "Frontend updates\nin real-time", ACCENT_CYAN),
-    ("10", "Results saved to\nPostgreSQL", RGBColor(0x19, 0x76, 0xD2)),
+    ("10", "Results saved to\nPostgreSQL", ACCENT_SKY),
 ]
 
 for i, (num, desc, color) in enumerate(steps):
@@ -331,18 +352,16 @@ for i, (num, desc, color) in enumerate(steps):
     circle.fill.fore_color.rgb = color
     circle.line.fill.background()
     tf = circle.text_frame
-    tf.paragraphs[0].text = num
-    tf.paragraphs[0].font.size = Pt(16)
-    tf.paragraphs[0].font.bold = True
-    tf.paragraphs[0].font.color.rgb = TEXT_WHITE
-    tf.paragraphs[0].alignment = PP_ALIGN.CENTER
     tf.vertical_anchor = MSO_ANCHOR.MIDDLE
+    p = tf.paragraphs[0]
+    p.text = num
+    style_paragraph(p, 16, TEXT_WHITE, bold=True, align=PP_ALIGN.CENTER)
 
     # Description
-    add_box(slide5, x, y + Inches(0.6), Inches(2.2), Inches(1.5), RGBColor(0x1a, 0x25, 0x40), desc, font_size=11, align=PP_ALIGN.CENTER, border_color=color)
+    add_box(slide5, x, y + Inches(0.6), Inches(2.2), Inches(1.5), PANEL_BG, desc, font_size=11, align=PP_ALIGN.CENTER, border_color=color)
 
 # ==================== SLIDE 6: Key Features ====================
-slide6 = prs.slides.add_slide(prs.slide_layouts[6])
+slide6 = prs.slides.add_slide(BLANK_LAYOUT)
 add_bg(slide6)
 
 add_text(slide6, Inches(0.5), Inches(0.2), Inches(12), Inches(0.5),
@@ -353,7 +372,7 @@ features = [
     ("10-Parameter AGI Evaluation", "Comprehensive scoring framework: Novel Problem Solving, Few-Shot Learning, Task Transfer, Abstract Reasoning + 6 more weighted parameters", ACCENT_PURPLE),
     ("Real-time Pipeline Updates", "WebSocket-based live updates through Redis pub/sub. Users see each phase complete in real-time with agent activity logs", ACCENT_CYAN),
     ("MCP + A2A Protocol Support", "Model Context Protocol (JSON-RPC 2.0) with 5 tools and Google A2A agent-to-agent communication with agent cards", ACCENT_ORANGE),
-    ("Collections & Organization", "User-curated paper collections across sessions. Add/remove papers, browse collection contents, public/private visibility", RGBColor(0x19, 0x76, 0xD2)),
+    ("Collections & Organization", "User-curated paper collections across sessions. Add/remove papers, browse collection contents, public/private visibility", ACCENT_SKY),
     ("Scheduled Research", "Automated recurring research: daily, weekly, biweekly, monthly. Celery Beat scheduler with run tracking and notifications", ACCENT_RED),
     ("Multi-Format Export", "Export research reports as Markdown, JSON, CSV, PDF, or Excel. Full data preservation including evaluations and scores", ACCENT_TEAL),
     ("Interactive Dashboard", "Analytics with KPI cards, score distribution charts, papers by source, sessions over time, and top-performing papers", RGBColor(0xFF, 0xD5, 0x4F)),
@@ -366,7 +385,7 @@ for i, (title, desc, color) in enumerate(features):
     y = Inches(0.9 + row * 1.55)
 
     add_box(slide6, x, y, Inches(6.1), Inches(0.35), color, title, font_size=13, bold=True, align=PP_ALIGN.LEFT)
-    add_box(slide6, x, y + Inches(0.38), Inches(6.1), Inches(1.0), RGBColor(0x1a, 0x25, 0x40), desc, font_size=10, border_color=color)
+    add_box(slide6, x, y + Inches(0.38), Inches(6.1), Inches(1.0), PANEL_BG, desc, font_size=10, border_color=color)
 
 # Save
 output_path = "/home/user/AI-Research-Agent/AI_Research_Agent_Architecture.pptx"